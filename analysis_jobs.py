@@ -0,0 +1,141 @@
+import time
+
+from chunked_analysis import build_analysis_messages
+from feedback import SectionStream, build_result_row, extract_structured_feedback
+from history_cache import save_result, shared_history
+from llm_cache import cached_completion, cached_stream
+from rate_limit import shared_limiter
+from speaker_stats import grounding_text, shared_speakers
+from tracing import span, traced
+from transcripts import fetch_transcript
+from workers import ANALYSIS_TIMEOUT, CONTRIBUTION_TIMEOUT, TimeoutError, cancel_all, submit, wait_result
+
+CONTRIBUTION_SYSTEM_PROMPT = "당신은 팀 회의에서 팀원별 기여도를 분석해주는 전문가입니다."
+
+# ✅ 분석 결과를 토큰 단위로 받아 항목별로 먼저 보여줄지 여부 (False 면 응답 전체를 받은 뒤 한 번에 파싱)
+STREAM_ANALYSIS = True
+
+# ✅ 로컬에서 계산한 화자별 발화 통계를 기여도 요청에 근거로 함께 전달
+GROUND_CONTRIBUTION = True
+
+
+def contribution_messages(meeting_text, grounding=""):
+    contribution_prompt = f"""
+                        다음은 회의 내용입니다. 이 회의에서 등장하는 참여자(이름)들을 기준으로, 각 인물이 회의에서 얼마나 기여했는지를 100% 기준으로 추정하여
+                        JSON 형식으로 결과를 먼저 출력하고, 그 다음 각 기여도에 대한 간단한 해석을 2줄 이내로 설명해주세요.
+                        아래 두 가지 항목을 순서대로 제공하세요:
+                        1. 기여도 비율 (JSON 형식)
+                        2. 각 팀원이 어떤 역할을 했는지, 왜 해당 기여도로 판단했는지 간단히 해석
+
+                        [회의 내용]
+                        {meeting_text}
+                        """
+    if grounding:
+        contribution_prompt += f"""
+                        아래는 회의록에서 직접 센 화자별 발화 통계입니다. 기여도를 추정할 때 참고하세요.
+                        {grounding}
+                        """
+    return [
+        {"role": "system", "content": CONTRIBUTION_SYSTEM_PROMPT},
+        {"role": "user", "content": contribution_prompt}
+    ]
+
+
+def analyze_meeting(report, openai_client, docs_service, gc, saved_team_name, title, doc_id,
+                    modified_time=None, context_team=None, similar_team=None):
+    """회의록 한 건 분석 → 저장 (JobQueue 작업 함수). 화면 출력 없이 결과 dict 를 반환합니다.
+
+    과거 회의 요약은 작업 시점에 ``context_team`` 의 이력에서 이번 회의록과 관련 있는 항목으로 만듭니다.
+
+    ``report`` 로 진행 단계와 완성된 항목(done)을 알려 화면에서 진행 상황을 보여 줍니다.
+    모든 OpenAI 호출은 프로세스 공유 한도(shared_limiter)를 거칩니다.
+    """
+    started = time.perf_counter()
+    limiter = shared_limiter()
+    history = shared_history(gc)
+
+    report(stage="회의록 불러오는 중")
+    with span("docs_fetch"):
+        meeting_text = fetch_transcript(docs_service, doc_id, modified_time)
+
+    # ✅ GPT 호출 전에 저장된 회의록 이력 전체에서 거의 같은 회의록 찾기
+    with span("near_duplicate"):
+        similar = history.similar_meetings(similar_team, meeting_text, exclude=(saved_team_name, title))
+
+    with span("context"):
+        context_summary = history.context_summary(context_team or saved_team_name, meeting_text, title)
+
+    # ✅ 화자별 발화 수/비중/응답 간격 (API 호출 없이 본문에서 직접 계산)
+    with span("speaker_stats"):
+        speakers = shared_speakers().summaries([meeting_text])[0]
+
+    # ✅ 팀원별 기여도는 회의 내용만 필요하므로 본 분석과 동시에 요청
+    contribution_future = submit(
+        traced, "contribution", cached_completion,
+        openai_client,
+        model="gpt-3.5-turbo",
+        messages=contribution_messages(meeting_text, grounding_text(speakers) if GROUND_CONTRIBUTION else ""),
+        timeout=CONTRIBUTION_TIMEOUT,
+        limiter=limiter,
+    )
+    try:
+        report(stage="GPT가 회의록을 분석 중입니다")
+        # ✅ 토큰 한도를 넘는 긴 회의록은 조각별로 동시에 정리한 뒤 합쳐서 분석
+        with span("chunk_map"):
+            analysis_messages = build_analysis_messages(
+                openai_client, meeting_text, context_summary, limiter=limiter, timeout=ANALYSIS_TIMEOUT
+            )
+        if STREAM_ANALYSIS:
+            # ✅ 소제목이 완성되는 대로 진행 상황에 반영 (화면에서 항목별로 먼저 출력)
+            stream = SectionStream()
+            with span("analysis"):
+                for delta in cached_stream(openai_client, model="gpt-4-turbo", messages=analysis_messages,
+                                           timeout=ANALYSIS_TIMEOUT, limiter=limiter):
+                    if stream.feed(delta):
+                        report(done=dict(stream.done))
+            with span("parse"):
+                parsed, _ = stream.finish()
+            result_text = stream.text
+        else:
+            with span("analysis"):
+                result_text = cached_completion(openai_client, model="gpt-4-turbo", messages=analysis_messages,
+                                                timeout=ANALYSIS_TIMEOUT, limiter=limiter)
+            with span("parse"):
+                parsed = extract_structured_feedback(result_text)
+
+        saved, save_error = None, None
+        if parsed:
+            # ✅ 이미 동일한 제목+본문이 저장된 경우 저장 생략 (팀/제목/본문 해시 색인 조회)
+            if history.is_duplicate(saved_team_name, title, meeting_text):
+                saved = "duplicate"
+            else:
+                try:
+                    with span("sheet_save"):
+                        save_result(gc, build_result_row(saved_team_name, title, parsed, meeting_text),
+                                    round(time.perf_counter() - started, 1))
+                    saved = "saved"
+                except Exception as e:
+                    save_error = str(e)
+
+        report(stage="팀원별 기여도 정리 중")
+        contribution_text, contribution_error = None, None
+        try:
+            # 본 분석 중에 이미 끝났으면 바로 사용
+            contribution_text = wait_result(contribution_future, CONTRIBUTION_TIMEOUT)
+        except TimeoutError:
+            contribution_error = "timeout"
+        except Exception as e:
+            contribution_error = str(e)
+    finally:
+        cancel_all(contribution_future)  # ✅ 분석 실패 시 대기 중인 요청 취소
+
+    return {
+        "result_text": result_text,
+        "parsed": parsed,
+        "similar": similar,
+        "speakers": speakers,
+        "saved": saved,
+        "save_error": save_error,
+        "contribution_text": contribution_text,
+        "contribution_error": contribution_error,
+    }
@@ -1,57 +1,14 @@
 import streamlit as st
-import pandas as pd
-import gspread
 import json
-from datetime import datetime
-from google.oauth2 import service_account
-from googleapiclient.discovery import build
-import openai
-import difflib
-from fpdf import FPDF
 import time
-from collections import Counter
-from wordcloud import WordCloud
-import matplotlib.pyplot as plt
-
-
-
-# ✅ 시스템 프롬프트
-SYSTEM_PROMPT = """
-당신은 교육공학 기반의 협력학습을 지원하는 지능형 피드백 챗봇입니다.
-이 팀은 중등 교사 대상 원격 직무연수 콘텐츠인 「에듀테크 활용 PBL 수업 실천법」을 설계하고 있으며,
-학생들은 실제 교육 현장에서 적용 가능한 수업 사례가 포함된 강의 콘텐츠를 개발해야 합니다.
-
-본 프로젝트는 다음 평가 기준에 기반하여 수행됩니다. 회의 내용을 분석할 때 이 기준과 부합하는지 판단하고, 그에 따른 분석과 피드백을 제공하세요:
-
-[과제 평가 기준]
-1. 과정 적합성: 콘텐츠 흐름과 컨셉이 ‘중등교사 대상 PBL 수업 실천 연수’에 적절한가?
-2. 사례의 구체성과 정확성: 제시된 수업 사례가 교과 및 학습자 맥락에 맞고, 교육적 타당성을 갖추었는가?
-3. 적용 가능성: 교사가 실제 적용 가능한 구체성과 현실성을 갖추었는가?
-4. 콘텐츠 구조 및 흐름: 강의의 전체 구성과 흐름이 논리적이고 자연스러운가?
-5. 내용 전달력: 교사가 듣고 쉽게 이해하고 따라할 수 있도록 구성되었는가?
-
-다음 7가지 영역에 따라 회의 내용을 분석하세요. 각 항목 이름을 그대로 소제목으로 사용하여 구분하세요.
-피드백을 제공할 때는 분석 결과를 기반으로하여 '팀원별 기여도', '잘한 점', '개선할 점', '다음 회의 제안'을 요약 포인트로 작성해서 제공하세요.
-각 항목은 1~2문장 이내로 간결하게 작성하되, 구체적인 예시를 포함하세요.
-
-7가지 분석 영역:
-1. 역할 정리: 누가 어떤 역할을 수행했는지, 각 팀원의 역할이 명확하게 정리되었는지 판단하세요. 역할 분담의 균형 여부와 팀워크 협력 수준을 분석하세요.
-2. 자기조절: 회의 과정에서 목표 설정, 작업 계획 수립, 일정 조율 등의 자기조절 전략이 어떻게 실행되었는지 확인하세요. 계획과 실행 사이의 조정 과정도 포함하세요.
-3. 메타인지: 팀이 현재 프로젝트 단계와 목표를 명확히 인식하고 있는지, 이를 바탕으로 전략적 사고(문제 해결 접근법, 조정 제안 등)가 이루어졌는지 판단하세요.
-4. 정서적 피드백: 회의 분위기와 팀원 간 정서적 상호작용(격려, 공감, 긍정적 피드백 등)을 분석하고, 팀의 몰입 및 동기 유발을 촉진하는 상호작용이 있었는지 평가하세요.
-5. 개선 제안: 현재 논의 및 작업의 부족한 점을 구체적으로 도출하고, 팀원들이 이를 인식하고 개선 방안을 제시했는지, 피드백 수용 과정이 원활했는지를 평가하세요.
-6. 진행 요약: 이전 회의 대비 작업 진행 상황을 요약하고, 현재 목표 달성도 및 과업 성취 여부를 점검하세요. 진행 속도와 질적 수준 모두를 고려하세요.
-7. 다음 회의 제안: 다음 회의나 작업 단계에서 해결해야 할 핵심 과제, 실행 전략을 구체적으로 제시하세요. 다음 단계로의 연결성을 고려한 계획 수립 여부를 점검하세요.
-
-[응답 형식 예시]
-역할 정리:
-자기조절:
-메타인지:
-정서적 피드백:
-개선 제안:
-진행 요약:
-다음 회의 제안:
-"""
+from llm_cache import cached_completion
+from feedback import SECTION_KEYS
+from settings import folder_ids
+from lazy_imports import import_report, prewarm
+from tracing import CACHE_HIT_SECONDS, cost_by_team, set_team, span, stage_stats
+from workers import submit
+
+
 
 st.set_page_config(page_title="교공이", layout="centered")
 st.title("🤖 교공이 챗봇")
@@ -59,74 +16,23 @@ st.title("🤖 교공이 챗봇")
 # ✅ 관리자 코드 설정
 ADMIN_CODE = "admin1234"
 
+# ✅ 분석 작업이 끝날 때까지 화면을 다시 그리는 간격(초)
+JOB_POLL_INTERVAL = 2
+
 team_codes = {
     "팀test": "2025", "AESPA팀": "bemyae", "쎔플팀": "0604", "삼삼오오팀": "3355", "피원에듀포팀": "R801",
     "상명서당팀": "qwer1234", "NCT팀": "nct127**"
 }
 
-folder_ids = {
-    "팀test": "1-9vL1B5O2LoS1uyBzPK3Y6kIfOSKG-Fo",
-    "AESPA팀": "1xdm-vXZ-bjch2bQWgHZ_GuQ8VjguCCaD",
-    "쎔플팀": "1BFqy-38ZOFEvxvqPBwRo5-SOaVSoK-oL",
-    "삼삼오오팀": "1Ey9nh0vICcDOtQrIQg0XbLEehqNIShYb",
-    "피원에듀포팀": "1kAb13Qipe-0xw2o6WbLXLi2xrcqjuxoc",
-    "상명서당팀": "1dkSXOSTMDewbt0oGj-FZvWHPCFpTe8vK",
-    "NCT팀": "17C8Yfjvr8d3kR1XLJtjfcx80xBjaON1p"
-}
-
 for key in ["authenticated", "team_name", "meeting_text", "result_text", "selected_file"]:
     if key not in st.session_state:
         st.session_state[key] = "" if key != "authenticated" else False
 
 # ✅ 회의 기록 불러오기
-def load_team_history(creds, team_name):
-    sh = gspread.authorize(creds).open_by_key("1LNKXL83dNvsHDOHEkw7avxKRsYWCiIIIYKUPiF1PZGY")
-    worksheet = sh.sheet1
-    data = worksheet.get_all_records()
-    df = pd.DataFrame(data)
-    df.columns = [str(col).strip() for col in df.columns]
-    if '시간' not in df.columns:
-        return pd.DataFrame()
-    df['시간'] = pd.to_datetime(df['시간'], errors='coerce')
-    return df[df['팀명'] == team_name].sort_values(by='시간')
-
-# ✅ 분석 결과 파싱 함수
-def extract_structured_feedback(text):
-    keys = ["역할 정리", "자기조절", "메타인지", "정서적 피드백", "개선 제안", "진행 요약", "다음 회의 제안"]
-    result = {k: "" for k in keys}
-    for k in keys:
-        if k in text:
-            try:
-                after = text.split(k)[1]
-                for other in keys:
-                    if other != k and other in after:
-                        after = after.split(other)[0]
-                result[k] = after.strip()
-            except:
-                result[k] = ""
-    return result
-
-# ✅ 시트 저장
-def save_to_sheet(gc, team_name, title, parsed, full_text=""):
-    try:
-        worksheet = gc.open_by_key("1LNKXL83dNvsHDOHEkw7avxKRsYWCiIIIYKUPiF1PZGY").sheet1
-        worksheet.append_row([
-            datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
-            team_name,
-            title,
-            parsed.get("역할 정리", ""),
-            parsed.get("자기조절", ""),
-            parsed.get("메타인지", ""),
-            parsed.get("정서적 피드백", ""),
-            parsed.get("개선 제안", ""),
-            parsed.get("진행 요약", ""),
-            parsed.get("다음 회의 제안", ""),
-            full_text  # ✅ 전체 회의록 추가
-            ])
-        return True
-    except Exception as e:
-        st.error(f"❌ 저장 실패: {e}")
-        return False
+def load_team_history(gc, team_name):
+    from history_cache import shared_history
+    # 시트 전체를 매번 받지 않고, 프로세스 공유 스냅샷에서 팀별 데이터를 꺼냄
+    return shared_history(gc).team_history(team_name)
 
 # ✅ 회의 요약 요점 출력
 def display_summary_feedback(parsed):
@@ -146,10 +52,132 @@ def display_summary_feedback(parsed):
     st.markdown("### ✨ 다음 회의 제안")
     st.markdown(parsed.get("다음 회의 제안", "").strip())
 
+# ✅ GPT 기반 팀원별 기여도 시각화
+def display_contribution(contribution_text):
+    import re
+    raw_text = contribution_text.strip()
+
+    # 🎯 JSON 부분만 추출 (중괄호 블록만)
+    json_str_match = re.search(r"\{.*\}", raw_text, re.DOTALL)
+    if not json_str_match:
+        raise ValueError("JSON 형식이 응답에 포함되지 않았습니다.")
+    contribution_json = json.loads(json_str_match.group())
+
+    # 해석 텍스트만 따로 추출
+    explanation_match = re.split(r"\}\s*", raw_text, maxsplit=1)
+    explanation_text = explanation_match[1].strip() if len(explanation_match) > 1 else "해석이 없습니다."
+
+    # 🎯 시각화
+    import matplotlib.pyplot as plt
+    from matplotlib import font_manager
+    # 한글 폰트 경로 지정 (로컬에 있을 경우 경로 수정 가능)
+    font_path = "fonts/malgun.ttf"  # 또는 절대 경로
+    font_prop = font_manager.FontProperties(fname=font_path)
+
+    st.markdown("#### 🔍 추정된 기여도 분포")
+    fig, ax = plt.subplots()
+    wedges, texts, autotexts = ax.pie(contribution_json.values(), 
+                                      labels=contribution_json.keys(), autopct='%1.1f%%', startangle=90, textprops={'fontsize': 12})
+
+    # 폰트 설정 적용
+    for t in texts + autotexts:
+        t.set_fontproperties(font_prop)
+        
+    ax.axis('equal')
+    st.pyplot(fig)
+    
+    # 해석 출력
+    st.markdown("#### 💬 기여도 해석")
+    st.info(explanation_text)
+
+# ✅ 회의록 본문에서 직접 센 화자별 발화 통계 (API 호출 없음)
+def display_speaker_stats(summary):
+    import matplotlib.pyplot as plt
+    from matplotlib import font_manager
+    from speaker_stats import speakers_frame
+
+    stats = speakers_frame(summary)
+    if stats.empty:
+        st.info("⚠️ 회의록에서 '이름: 내용' 형식의 발화를 찾지 못했습니다.")
+        return
+    font_prop = font_manager.FontProperties(fname="fonts/malgun.ttf")
+
+    st.markdown(f"#### 🗣️ 발화 비중 (전체 {summary['turns']}차례)")
+    fig, ax = plt.subplots()
+    wedges, texts, autotexts = ax.pie(stats["글자 수"], labels=stats["화자"], autopct='%1.1f%%', startangle=90,
+                                      textprops={'fontsize': 12})
+    for t in texts + autotexts:
+        t.set_fontproperties(font_prop)
+    ax.axis('equal')
+    st.pyplot(fig)
+    st.dataframe(stats.set_index("화자"), use_container_width=True)
+
+# ✅ 분석 작업 상태/결과 출력 (대기·진행 중이면 잠시 후 다시 그림)
+def display_job(job):
+    from job_queue import FAILED, QUEUED, RUNNING
+    if job["status"] == QUEUED:
+        st.info(f"⏳ 분석 대기 중입니다. (앞에 {job.get('position', 0)}건)")
+    elif job["status"] == RUNNING:
+        progress = job.get("progress", {})
+        done = progress.get("done", {})
+        st.caption(f"✍️ {progress.get('stage', '분석 중')}... ({len(done)}/{len(SECTION_KEYS)})")
+        for key, body in done.items():
+            st.markdown(f"**{key}**\n\n{body}")
+    if job["status"] in (QUEUED, RUNNING):
+        st.session_state.poll_job = True
+        return
+
+    if job["status"] == FAILED:
+        if "RateLimitError" in (job["error"] or ""):
+            st.warning("⏱️ 요청이 너무 빠릅니다. 5초 후 다시 시도해주세요.")
+        else:
+            st.error(f"❌ 오류 발생: {job['error']}")
+        return
+
+    result = job["result"]
+    st.session_state.result_text = result["result_text"]
+    for top in result["similar"][:1]:
+        st.info(f"⚠️ 이전 회의록 '{top['회의록 제목']}'({top['팀명']})과 매우 유사합니다 "
+                f"(유사도 {top['유사도']:.0%}). 동일 회의일 수 있습니다.")
+    st.success("✅ 분석 완료!")
+    if not result["parsed"]:
+        return
+    if result["saved"] == "duplicate":
+        st.info(f"✅ 동일한 회의록 내용을 분석한 이력이 있습니다.")
+    elif result["saved"] == "saved":
+        st.success("📌 회의록 내용이 확인되었습니다.")
+    elif result["save_error"]:
+        st.error(f"❌ 저장 실패: {result['save_error']}")
+    display_summary_feedback(result["parsed"])
+
+    if result.get("speakers"):
+        st.subheader("🗣️ 회의록 발화 통계")
+        with st.expander("📊 화자별 발화 수/비중", expanded=True):
+            display_speaker_stats(result["speakers"])
+
+    st.subheader("👥 GPT 기반 팀원별 기여도")
+    with st.expander("📈 팀원별 기여도 분석"):
+        if result["contribution_error"] == "timeout":
+            st.warning("⚠️ 기여도 분석 시간이 초과되었습니다.")
+        elif result["contribution_error"]:
+            st.warning(f"⚠️ 기여도 분석 실패: {result['contribution_error']}")
+        else:
+            try:
+                display_contribution(result["contribution_text"])
+            except Exception as e:
+                st.warning(f"⚠️ 기여도 분석 실패: {e}")
+
 def add_dashboard(df):
     import altair as alt
-    from gensim import corpora
-    from gensim.models.ldamodel import LdaModel
+    import matplotlib.pyplot as plt
+    import pandas as pd
+    import clients
+    from wordcloud import WordCloud
+    from rate_limit import shared_limiter
+    from transcript_store import transcript_hash
+    from speaker_stats import history_frame
+    from token_index import shared_index, term_frame, top_terms
+    from topic_models import shared_topics
 
 
     # ✅ 회의록 제목 기준 중복 제거
@@ -157,21 +185,13 @@ def add_dashboard(df):
 
     st.header("📊 팀 회의 대시보드")
 
-    def clean_korean_text(text):
-        import re
-        text = re.sub(r"[^가-힣\s]", "", text)
-        words = text.split()
-        stopwords = set([
-            "그리고", "그러나", "때문에", "등",
-            "위한", "하는", "있다", "있습니다", "이다", "된다", "같다",
-            "경우", "정도", "부분", "내용", "방법", "활동", "결과", "제시",
-            "대한", "대해", "이에", "로서",
-            "으로", "것이", "로부터", "에게", "된다면", "합니다", "있어요"
-        ])
-        return [w for w in words if len(w) > 1 and w not in stopwords and len(w) <= 6]
-
+    # "전체 회의록" 은 압축 저장소 참조 → 본문은 토큰 색인에 없는 회차만 읽음
     df["분석텍스트"] = df["전체 회의록"].fillna("")
 
+    # ✅ 회차별 토큰/빈도는 본문 해시 기준으로 한 번만 계산해 재사용
+    token_entries = shared_index().entries(df["분석텍스트"].tolist())
+    term_df = term_frame([counts for _, counts in token_entries])
+
     # 1️⃣ 워드클라우드 & 키워드 변화 추이
     with st.expander("🔍 회차별 핵심 키워드", expanded=False):
         col1, col2 = st.columns([1, 1.5])
@@ -181,8 +201,8 @@ def add_dashboard(df):
                     selected_idx = 1
                 else:
                     selected_idx = st.slider("WordCloud 회차 선택", 1, len(df), 1, key="wordcloud_slider")
-                text = " ".join(clean_korean_text(df.iloc[selected_idx - 1]["분석텍스트"]))
-                if not text.strip():
+                frequencies = token_entries[selected_idx - 1][1]
+                if not frequencies:
                     st.info("⚠️ 해당 회차에는 표시할 키워드가 충분하지 않습니다.")
                 else:
                     wordcloud = WordCloud(
@@ -194,18 +214,15 @@ def add_dashboard(df):
                         max_font_size=90,
                         prefer_horizontal=0.9,
                         colormap='Dark2'
-                    ).generate(text)
+                    ).generate_from_frequencies(frequencies)
                     fig1, ax1 = plt.subplots(figsize=(6, 4))
                     ax1.imshow(wordcloud, interpolation='bilinear')
                     ax1.axis("off")
                     st.pyplot(fig1)
 
         with col2:
-            tokenized = df["분석텍스트"].apply(clean_korean_text)
-            all_words = [word for row in tokenized for word in row if len(word) <= 6]
-            top_keywords = [kw for kw, _ in Counter(all_words).most_common(4)]
-            trend_data = [[row.count(kw) for kw in top_keywords] for row in tokenized]
-            trend_df = pd.DataFrame(trend_data, columns=top_keywords)
+            top_keywords = top_terms(term_df, 4)
+            trend_df = term_df.reindex(columns=top_keywords, fill_value=0)
             trend_df["회차"] = [f"{i+1}회차" for i in range(len(df))]
             trend_df_melted = trend_df.melt(id_vars="회차", var_name="키워드", value_name="빈도")
 
@@ -220,17 +237,38 @@ def add_dashboard(df):
             )
             st.altair_chart(chart, use_container_width=True)
 
+    # ✅ 회차별 화자 발화 비중 추이 (본문 해시별로 한 번만 계산, API 호출 없음)
+    with st.expander("🗣️ 회차별 발화 비중 추이", expanded=False):
+        speaker_df = history_frame(df)
+        if speaker_df.empty:
+            st.info("⚠️ 회의록에서 '이름: 내용' 형식의 발화를 찾지 못했습니다.")
+        else:
+            chart = alt.Chart(speaker_df).mark_line(point=True).encode(
+                x=alt.X("회차:N", title="회의 회차", sort=None, axis=alt.Axis(labelAngle=0)),
+                y=alt.Y("글자 비율:Q", title="발화 글자 비중", axis=alt.Axis(format="%")),
+                color=alt.Color("화자:N", title="화자"),
+                tooltip=["회차", "회의록 제목", "화자", "발화 수", alt.Tooltip("글자 비율:Q", format=".1%"), "평균 응답 간격(초)"]
+            ).properties(
+                title="회차별 화자 발화 비중 변화",
+                width=500, height=300
+            )
+            st.altair_chart(chart, use_container_width=True)
+
     # 2️⃣ LDA 분석 & 요약
     with st.expander("🧠 회의록 텍스트 LDA 분석", expanded=False):
         selected_indexes = st.multiselect("분석할 회차 선택", df.index, format_func=lambda i: df.loc[i, "회의록 제목"] or f"{i+1}회차")
 
         if selected_indexes:
-            selected_texts = df.loc[selected_indexes, "분석텍스트"].apply(clean_korean_text).tolist()
-            dictionary = corpora.Dictionary(selected_texts)
-            corpus = [dictionary.doc2bow(text) for text in selected_texts]
+            # ✅ (팀, 선택 회차, 토픽 수)별로 학습된 모델을 재사용, 팀 단위 Dictionary 공유
+            topics = shared_topics()
+            model_key, lda_model = topics.get_model(
+                df["팀명"].iloc[0],
+                [transcript_hash(df.loc[i, "분석텍스트"]) for i in selected_indexes],
+                [token_entries[i][0] for i in selected_indexes],
+                num_topics=3
+            )
 
-            if len(dictionary) > 0 and len(corpus) > 0:
-                lda_model = LdaModel(corpus=corpus, id2word=dictionary, num_topics=3, random_state=42)
+            if lda_model is not None:
 
                 topic_keywords = []
                 for i in range(3):
@@ -263,16 +301,19 @@ def add_dashboard(df):
 항목마다 이모지를 붙여주세요.
 """
 
-                    openai_client = openai.OpenAI(api_key=st.secrets["OPENAI_API_KEY"])
-
-                    topic_response = openai_client.chat.completions.create(
-                        model="gpt-3.5-turbo",
-                        messages=[
-                            {"role": "system", "content": "당신은 교육 회의 내용을 요약하는 조력자입니다."},
-                            {"role": "user", "content": summary_prompt}
-                        ]
-                    )
-                    summary_text = topic_response.choices[0].message.content
+                    openai_client = clients.openai_client(st.secrets["OPENAI_API_KEY"])
+
+                    summary_text = topics.summaries.get(model_key)
+                    if summary_text is None:
+                        summary_text = topics.summaries[model_key] = cached_completion(
+                            openai_client,
+                            model="gpt-3.5-turbo",
+                            messages=[
+                                {"role": "system", "content": "당신은 교육 회의 내용을 요약하는 조력자입니다."},
+                                {"role": "user", "content": summary_prompt}
+                            ],
+                            limiter=shared_limiter(),  # ✅ 분석 작업과 같은 OpenAI 호출 한도 사용
+                        )
                     st.markdown("### 🧠 이번 회의에서 논의된 주제 요약")
                     st.info(summary_text)
 
@@ -303,6 +344,56 @@ if code_input:
             st.error("❌ 잘못된 팀 코드입니다.")
 
 if st.session_state.authenticated:
+    # ✅ 무거운 모듈은 인증 이후에만 불러오고, 대시보드/PDF/차트용 모듈은 백그라운드에서 미리 불러옴
+    prewarm()
+    import clients
+    from analysis_jobs import analyze_meeting
+    from drive_listing import shared_listing
+    from job_queue import QUEUED, RUNNING, shared_jobs
+    from history_cache import shared_history
+
+    if st.session_state.is_admin:
+        with st.expander("⏱️ 모듈 import 시간", expanded=False):
+            st.table(import_report())
+        # ✅ 단계별 소요 시간(p50/p95)과 팀별 토큰 사용량/예상 비용 (.cache/metrics.jsonl)
+        with st.expander("📈 단계별 소요 시간 / 비용", expanded=False):
+            st.dataframe(stage_stats())
+            st.dataframe(cost_by_team())
+        # ✅ 시트에는 참조만 있고 본문 파일(.cache/blobs)이 없는 회의록 (통계/검색에서 빈 본문으로 처리됨)
+        from transcript_store import BLOB_DIR, shared_blobs
+        missing_blobs = shared_blobs().missing_count()
+        if missing_blobs:
+            st.warning(f"⚠️ 본문 파일을 찾지 못한 회의록 {missing_blobs}건: `{BLOB_DIR}` 폴더가 "
+                       f"지워졌거나 옮겨졌는지 확인하고 백업에서 복원해 주세요.")
+
+    # ✅ 인증 정보/클라이언트는 프로세스당 한 번만 만들고 모든 세션이 함께 사용 (연결 풀 재사용)
+    creds_json = st.secrets["google"]["GOOGLE_SERVICE_ACCOUNT"]
+    gc = clients.sheets_client(creds_json)
+    drive_service = clients.drive_service(creds_json)
+    docs_service = clients.docs_service(creds_json)
+    openai_client = clients.openai_client(st.secrets["OPENAI_API_KEY"])
+
+    # ✅ 관리자: 모든 팀 집계를 한 화면에 (백그라운드에서 주기적으로 다시 계산한 결과 사용)
+    if st.session_state.is_admin and st.checkbox("🗂️ 전체 팀 개요 보기"):
+        from overview import OVERVIEW_INTERVAL, shared_overview
+        overview_cache = shared_overview(shared_history(gc), folder_ids.keys())
+        if st.button("🔄 개요 다시 계산"):
+            overview_cache.refresh_now()
+        overview = overview_cache.wait(timeout=30)
+        if overview is None:
+            st.warning(f"⚠️ 개요를 아직 계산하지 못했습니다: {overview_cache.last_error or '계산 중'}")
+        else:
+            st.subheader("🗂️ 전체 팀 개요")
+            st.caption(f"🕒 {time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(overview_cache.computed_at))} 기준 "
+                       f"(약 {OVERVIEW_INTERVAL // 60}분마다 자동 갱신)")
+            st.dataframe(overview.drop(columns=["최근 진행 요약"]))
+            st.bar_chart(overview["회의 수"])
+            for overview_team, row in overview.iterrows():
+                if isinstance(row["최근 진행 요약"], str) and row["최근 진행 요약"].strip():
+                    with st.expander(f"📌 {overview_team} 최근 진행 요약"):
+                        st.markdown(row["최근 진행 요약"])
+        st.stop()
+
     # 관리자 모드면 선택한 팀이 있고, 일반 사용자는 고정된 팀이 있음
     if st.session_state.is_admin:
         team_name = st.selectbox("📁 분석할 팀 선택", list(folder_ids.keys()))
@@ -317,183 +408,89 @@ if st.session_state.authenticated:
         st.stop()
 
     # 분석 후 저장 시, 아래처럼 처리
+    set_team(team_name)  # ✅ 이후 기록되는 소요 시간/토큰 사용량은 이 팀으로 집계
 
-    creds_info = json.loads(st.secrets["google"]["GOOGLE_SERVICE_ACCOUNT"])
-    scopes = [
-        'https://www.googleapis.com/auth/spreadsheets',
-        'https://www.googleapis.com/auth/drive.readonly',
-        'https://www.googleapis.com/auth/documents.readonly'
-    ]
-    creds = service_account.Credentials.from_service_account_info(creds_info, scopes=scopes)
-    gc = gspread.authorize(creds)
-    drive_service = build('drive', 'v3', credentials=creds)
-    docs_service = build('docs', 'v1', credentials=creds)
-    openai_client = openai.OpenAI(api_key=st.secrets["OPENAI_API_KEY"])
-
-    team_df = load_team_history(creds, team_name)
+    # 다시 실행될 때마다 지나가는 단계는 실제로 시트/드라이브를 읽은 경우만 기록 (지표 파일 크기 제한)
+    with span("sheet_load", min_seconds=CACHE_HIT_SECONDS):
+        team_df = load_team_history(gc, team_name)
     if not team_df.empty:
-        add_dashboard(team_df)
+        with span("dashboard"):
+            add_dashboard(team_df)
 
-    results = drive_service.files().list(
-        q=f"'{folder_id}' in parents and mimeType='application/vnd.google-apps.document'",
-        pageSize=10,
-        fields="files(id, name, createdTime)"
-    ).execute()
-    files = results.get('files', [])
+    # ✅ 회의록 목록은 모든 페이지를 합쳐 캐시하고, 이후에는 새로 추가/수정된 문서만 받아옴
+    if st.session_state.is_admin:
+        # 관리자는 모든 팀 폴더를 한 번의 배치 요청으로 갱신 (팀을 바꿔도 다시 요청하지 않음)
+        with span("drive_list", min_seconds=CACHE_HIT_SECONDS):
+            listings = shared_listing().all_folders(drive_service, folder_ids)
+        files = listings[team_name]
+        with st.expander("📂 팀별 회의록 수", expanded=False):
+            st.table([{"팀명": team, "회의록 수": len(docs)} for team, docs in listings.items()])
+    else:
+        with span("drive_list", min_seconds=CACHE_HIT_SECONDS):
+            files = shared_listing().files(drive_service, folder_id)
 
     if files:
-        file_dict = {f["name"]: f["id"] for f in sorted(files, key=lambda x: x['createdTime'])}
+        file_dict = {f["name"]: f["id"] for f in files}
+        modified_times = {f["id"]: f.get("modifiedTime") for f in files}
         selected_file = st.selectbox("📝 회의록 회차 선택", list(file_dict.keys()))
         st.session_state.selected_file = selected_file
 
-        if st.button("🔍 회의록 분석 시작", disabled=st.session_state.get("button_disabled", False)):
+        # ✅ 분석은 프로세스 공유 작업 대기열에서 실행 (다시 실행/새로고침해도 진행 상황과 결과가 유지됨)
+        jobs = shared_jobs()
+        job = jobs.status(st.session_state.get("analysis_job")) or jobs.latest(team_name, selected_file)
+        if job and (job["team"], job["title"]) != (team_name, selected_file):
+            job = jobs.latest(team_name, selected_file)
+        job_active = bool(job) and job["status"] in (QUEUED, RUNNING)
+
+        if st.button("🔍 회의록 분석 시작", disabled=job_active):
             st.session_state["show_dashboard"] = False  # ✅ 대시보드 상태 초기화
-            st.session_state.button_disabled = True
-            time.sleep(2)
+            doc_id = file_dict[selected_file]
+            st.session_state.analysis_job = jobs.submit(
+                team_name, selected_file, analyze_meeting,
+                openai_client, docs_service, gc,
+                saved_team_name="관리자" if st.session_state.is_admin else team_name,
+                title=selected_file,
+                doc_id=doc_id,
+                modified_time=modified_times.get(doc_id),
+                context_team=team_name,  # ✅ 과거 회의 요약은 작업에서 이번 회의록 기준으로 골라 만듦
+                similar_team=None if st.session_state.is_admin else team_name,  # 관리자는 모든 팀에서 찾기
+            )
+            job = jobs.status(st.session_state.analysis_job)
+            job_active = True
 
-            try:
-                doc = docs_service.documents().get(documentId=file_dict[selected_file]).execute()
-                elements = doc.get("body", {}).get("content", [])
-                meeting_text = ''.join(
-                    elem['textRun']['content']
-                    for v in elements if 'paragraph' in v
-                    for elem in v['paragraph'].get('elements', []) if 'textRun' in elem
-                )
-                st.session_state.meeting_text = meeting_text
-
-
-                if "context_summary" not in st.session_state:
-                    st.session_state.context_summary = "\n".join([
-                        f"[{row['시간']}] {row.get('회의록 제목', '')}" for _, row in team_df.iterrows()
-                    ])
-                context_summary = st.session_state.context_summary
-                
-                if team_df.shape[0] > 0:
-                    last_text = str(team_df.iloc[-1].get("개선 제안", "")) + str(team_df.iloc[-1].get("진행 요약", ""))
-                    similarity = difflib.SequenceMatcher(None, meeting_text.strip(), last_text.strip()).ratio()
-                    if similarity >= 0.9:
-                        st.info("⚠️ 이전 회의와 매우 유사합니다. 동일 회의일 수 있습니다.")
-
-                with st.spinner("GPT가 회의록을 분석 중입니다..."):
-                    response = openai_client.chat.completions.create(
-                        model="gpt-4-turbo",
-                        messages=[
-                            {"role": "system", "content": SYSTEM_PROMPT},
-                            {"role": "user", "content": f"[과거 회의 요약]\n{context_summary}\n\n[이번 회의 내용]\n{meeting_text}"}
-                        ]
-                    )
-                    result_text = response.choices[0].message.content
-                    st.session_state.result_text = result_text
-                    st.success("✅ 분석 완료!")
-
-                    parsed = extract_structured_feedback(result_text)
-                    if parsed:
-                        saved_team_name = "관리자" if st.session_state.is_admin else team_name  # ✅ 먼저 정의
-                        already_saved = pd.DataFrame()
-                        if not team_df.empty:
-                        # ✅ 이미 동일한 제목+본문이 저장된 경우 저장 생략
-                            already_saved = team_df[
-                                (team_df["회의록 제목"] == selected_file) &
-                                (team_df["전체 회의록"] == meeting_text) &
-                                (team_df["팀명"] == saved_team_name)
-                            ]
-                    
-                        if not already_saved.empty:
-                            st.info(f"✅ 동일한 회의록 내용을 분석한 이력이 있습니다.")
-                        else:
-                            if save_to_sheet(gc, saved_team_name, selected_file, parsed, meeting_text):
-                                st.success("📌 회의록 내용이 확인되었습니다.")
-                        display_summary_feedback(parsed)
-
-                        # ✅ GPT 기반 팀원별 기여도 추정 및 시각화
-                        st.subheader("👥 GPT 기반 팀원별 기여도")
-                        with st.expander("📈 팀원별 기여도 분석"):
-                            try:
-                                contribution_prompt = f"""
-                        다음은 회의 내용입니다. 이 회의에서 등장하는 참여자(이름)들을 기준으로, 각 인물이 회의에서 얼마나 기여했는지를 100% 기준으로 추정하여 
-                        JSON 형식으로 결과를 먼저 출력하고, 그 다음 각 기여도에 대한 간단한 해석을 2줄 이내로 설명해주세요.
-                        아래 두 가지 항목을 순서대로 제공하세요:
-                        1. 기여도 비율 (JSON 형식)
-                        2. 각 팀원이 어떤 역할을 했는지, 왜 해당 기여도로 판단했는지 간단히 해석
-                        
-                        [회의 내용]
-                        {meeting_text}
-                        """
-                                contribution_response = openai_client.chat.completions.create(
-                                    model="gpt-3.5-turbo",
-                                    messages=[
-                                        {"role": "system", "content": "당신은 팀 회의에서 팀원별 기여도를 분석해주는 전문가입니다."},
-                                        {"role": "user", "content": contribution_prompt}
-                                    ]
-                                )
-
-                                import re
-                                raw_text = contribution_response.choices[0].message.content.strip()
-
-                                # 🎯 JSON 부분만 추출 (중괄호 블록만)
-                                json_str_match = re.search(r"\{.*\}", raw_text, re.DOTALL)
-                                if not json_str_match:
-                                    raise ValueError("JSON 형식이 응답에 포함되지 않았습니다.")
-                                contribution_json = json.loads(json_str_match.group())
-
-                                # 해석 텍스트만 따로 추출
-                                explanation_match = re.split(r"\}\s*", raw_text, maxsplit=1)
-                                explanation_text = explanation_match[1].strip() if len(explanation_match) > 1 else "해석이 없습니다."
-
-                                # 🎯 시각화
-                                from matplotlib import font_manager
-                                # 한글 폰트 경로 지정 (로컬에 있을 경우 경로 수정 가능)
-                                font_path = "fonts/malgun.ttf"  # 또는 절대 경로
-                                font_prop = font_manager.FontProperties(fname=font_path)
-
-                                st.markdown("#### 🔍 추정된 기여도 분포")
-                                fig, ax = plt.subplots()
-                                wedges, texts, autotexts = ax.pie(contribution_json.values(), 
-                                                                  labels=contribution_json.keys(), autopct='%1.1f%%', startangle=90, textprops={'fontsize': 12})
-
-                                # 폰트 설정 적용
-                                for t in texts + autotexts:
-                                    t.set_fontproperties(font_prop)
-                                    
-                                ax.axis('equal')
-                                st.pyplot(fig)
-                                
-                                # 해석 출력
-                                st.markdown("#### 💬 기여도 해석")
-                                st.info(explanation_text)
-                        
-                            
-                            except Exception as e:
-                                st.warning(f"⚠️ 기여도 분석 실패: {e}")
-            
-            except openai.RateLimitError:
-                st.warning("⏱️ 요청이 너무 빠릅니다. 5초 후 다시 시도해주세요.")
-            except Exception as e:
-                st.error(f"❌ 오류 발생: {str(e)}")
-            finally:
-                st.session_state.button_disabled = False
-
-        import re
-        class UnicodePDF(FPDF):
-            def __init__(self):
-                super().__init__()
-                self.add_page()
-                self.add_font("malgun", "", "fonts/malgun.ttf", uni=True)  # ✅ 폰트 경로는 직접 추가해야 함
-                self.set_font("malgun", size=12)
-
-            def add_text(self, text):
-                text = re.sub(r'[\U00010000-\U0010ffff]', '', text)  # 이모지 제거
-                for line in text.split('\n'):
-                    self.multi_cell(0, 10, line)
- 
-        if st.session_state.result_text:
-           if st.button("📄 분석 결과 PDF로 저장"):
-               filename = f"{selected_file}_분석결과.pdf"
-               pdf = UnicodePDF()
-               pdf.add_text(st.session_state.result_text)
-               pdf.output(filename)
-               with open(filename, "rb") as f:
-                   st.download_button("⬇️ PDF 다운로드", f, file_name=filename) 
+        if job:
+            display_job(job)
 
+        from pdf_export import export_history, render_result
 
+        if st.session_state.result_text:
+           if st.button("📄 분석 결과 PDF로 저장"):
+               # ✅ 파일을 만들지 않고 메모리에서 바로 PDF 생성 (세션 간 파일 충돌 없음)
+               pdf_bytes = render_result(st.session_state.result_text)
+               st.download_button("⬇️ PDF 다운로드", pdf_bytes, file_name=f"{selected_file}_분석결과.pdf")
+
+        # ✅ 팀(관리자는 전체 팀) 분석 이력을 한 파일로 내보내기 — 작업자 스레드에서 생성
+        with st.expander("📚 분석 이력 일괄 내보내기", expanded=False):
+            export_format = st.radio("내보내기 형식", ["PDF (한 파일)", "ZIP (회차별 PDF)"], horizontal=True)
+            if st.button("📦 내보내기 시작"):
+                export_teams = list(folder_ids.keys()) if st.session_state.is_admin else [team_name]
+                fmt = "zip" if export_format.startswith("ZIP") else "pdf"
+                frames = [load_team_history(gc, t) for t in export_teams]
+                label = "전체팀" if len(export_teams) > 1 else team_name
+                st.session_state.export_job = (submit(export_history, frames, fmt), f"{label}_분석이력.{fmt}")
+
+            export_job = st.session_state.get("export_job")
+            if export_job:
+                export_future, export_filename = export_job
+                if not export_future.done():
+                    st.info("⏳ 내보내기 파일을 만드는 중입니다. 잠시 후 상태를 확인해주세요.")
+                    st.button("🔄 상태 확인")
+                elif export_future.exception() is not None:
+                    st.error(f"❌ 내보내기 실패: {export_future.exception()}")
+                else:
+                    st.download_button("⬇️ 내보내기 파일 다운로드", export_future.result(), file_name=export_filename)
 
+        # ✅ 분석 작업이 진행 중이면 잠시 후 화면을 다시 그려 상태를 갱신
+        if st.session_state.pop("poll_job", False):
+            time.sleep(JOB_POLL_INTERVAL)
+            st.rerun()
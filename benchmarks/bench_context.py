@@ -0,0 +1,109 @@
+"""분석 프롬프트의 [과거 회의 요약] 크기/생성 시간 비교 벤치마크.
+
+    python benchmarks/bench_context.py [--meetings 10 --meetings 100 ...] [--budget 1500] [--repeat 5]
+
+팀 이력(합성 시트 행)을 회의 수별로 만들고, 이전 방식(legacy_context_summary:
+모든 회의의 "[시간] 제목" 나열)과 context_index 의 관련도/최근성 선택 방식을 비교합니다.
+프롬프트 토큰 수, 분석 1회당 입력 토큰 예상 비용, 생성 시간(색인 첫 구성/새 행 반영/선택)을 출력합니다.
+"""
+import argparse
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import fakes  # noqa: E402  (저장소 모듈은 캐시 폴더를 정한 뒤 main 에서 불러옴)
+
+TEAM = "벤치팀"
+
+
+def legacy_context_summary(team_df):
+    # 이전 구현(feedback.build_context_summary): 과거 회의 목록을 "[시간] 회의록 제목" 한 줄씩
+    return "\n".join([
+        f"[{row['시간']}] {row.get('회의록 제목', '')}" for _, row in team_df.iterrows()
+    ])
+
+
+def median_ms(fn, repeat):
+    runs = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        runs.append((time.perf_counter() - start) * 1000)
+    return statistics.median(runs)
+
+
+def run(meetings, budget, repeat, transcript_chars):
+    from chunked_analysis import count_tokens
+    from context_index import ContextIndex
+    from results_store import ResultsStore
+    from settings import RESULT_COLUMNS, cache_path
+    from tracing import estimate_cost
+
+    store = ResultsStore(cache_path("bench", f"context-{meetings}-{time.time_ns()}.db"))
+    store.import_sheet_rows(RESULT_COLUMNS, fakes.make_sheet_rows([TEAM], meetings, 200))
+    team_df = store.team_frame(TEAM)
+    text = fakes.make_transcript(random.Random(meetings), transcript_chars)
+
+    legacy = legacy_context_summary(team_df)
+    legacy_ms = median_ms(lambda: legacy_context_summary(team_df), repeat)
+
+    index = ContextIndex()
+    start = time.perf_counter()
+    index.sync(store)
+    cold_ms = (time.perf_counter() - start) * 1000
+    select_ms = median_ms(lambda: index.select(TEAM, text, budget=budget), repeat)
+
+    # 저장 직후 반영: 새 행 하나만 색인
+    store.add_result(fakes.make_sheet_rows([TEAM], 1, 200, seed=meetings + 1)[0])
+    start = time.perf_counter()
+    index.sync(store)
+    incremental_ms = (time.perf_counter() - start) * 1000
+    selected = index.select(TEAM, text, budget=budget)
+
+    legacy_tokens, selected_tokens = count_tokens(legacy), count_tokens(selected)
+    return {
+        "회의 수": meetings,
+        "이전 토큰": legacy_tokens,
+        "이전 비용($)": estimate_cost("gpt-4-turbo", legacy_tokens, 0),
+        "이전(ms)": legacy_ms,
+        "선택 토큰": selected_tokens,
+        "선택 비용($)": estimate_cost("gpt-4-turbo", selected_tokens, 0),
+        "선택 항목": selected.count("\n\n") + 1 if selected else 0,
+        "색인(ms)": cold_ms,
+        "새 행(ms)": incremental_ms,
+        "선택(ms)": select_ms,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--meetings", type=int, action="append", help="팀 이력 회의 수 (여러 번 지정 가능)")
+    parser.add_argument("--budget", type=int, help="과거 회의 요약 토큰 한도 (기본: context_index.CONTEXT_TOKENS)")
+    parser.add_argument("--transcript-chars", type=int, default=20000, help="이번 회의록 길이(자)")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    # 저장소 모듈을 불러오기 전에 캐시 폴더를 정해야 실제 .cache 를 건드리지 않음
+    os.environ["GYOGONG_CACHE_DIR"] = tempfile.mkdtemp(prefix="gyogong-bench-")
+    from context_index import CONTEXT_TOKENS
+    budget = args.budget or CONTEXT_TOKENS
+
+    rows = [run(n, budget, args.repeat, args.transcript_chars) for n in args.meetings or [10, 50, 200, 1000]]
+    print(f"토큰 한도 {budget}, 비용은 gpt-4-turbo 입력 토큰 기준 분석 1회당 예상치\n")
+    print(f"{'회의 수':>6} {'이전 토큰':>9} {'이전 비용($)':>11} {'이전(ms)':>9} {'선택 토큰':>9} {'선택 비용($)':>11} "
+          f"{'선택 항목':>8} {'색인(ms)':>9} {'새 행(ms)':>9} {'선택(ms)':>9}")
+    for r in rows:
+        print(f"{r['회의 수']:>6} {r['이전 토큰']:>9} {r['이전 비용($)']:>11.4f} {r['이전(ms)']:>9.2f} "
+              f"{r['선택 토큰']:>9} {r['선택 비용($)']:>11.4f} {r['선택 항목']:>8} {r['색인(ms)']:>9.1f} "
+              f"{r['새 행(ms)']:>9.2f} {r['선택(ms)']:>9.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,335 @@
+"""실제 구글/OpenAI 인증 없이 돌리는 종단 간(end-to-end) 벤치마크.
+
+    python benchmarks/bench_end_to_end.py [--rows 3000] [--transcript-chars 20000] [--repeat 5]
+        [--sheets-latency 0.3] [--google-latency 0.15] [--openai-latency 1.0]
+        [--scenario history_load --scenario app_page ...]
+        [--save result.json] [--baseline result.json] [--tolerance 0.2]
+
+gspread, Drive/Docs 클라이언트, OpenAI chat API 를 benchmarks/fakes.py 의 대역으로 바꾸고
+합성 시트(수천 행)와 긴 한국어 회의록으로 아래 시나리오를 측정합니다.
+
+    history_load       팀 이력 불러오기 (load_team_history: 첫 전체 읽기 / 메모리 재사용 / 새 행 이어 읽기)
+    display_dashboard  dashboard.display_dashboard
+    app_page           app.py 첫 화면 (이력 + add_dashboard + 회의록 목록), streamlit AppTest
+    app_analyze        app.py 회의록 분석 → 저장 전체 흐름 (작업 대기열의 작업이 끝날 때까지), streamlit AppTest
+    docs_analyze       docs_analyze.run_batch (모든 팀 일괄 분석)
+    docs_analyze_fresh_cache  빈 .cache 에서 run_batch: 시트에 이미 있는 회의록을 다시 분석/저장하면 실패
+
+--baseline 으로 이전 결과(--save)를 주면 중앙값이 tolerance 이상 느려진 시나리오를 표시하고
+종료 코드 1을 반환합니다 (시나리오가 실패해도 1). 필요한 패키지가 없는 시나리오는 건너뜁니다.
+"""
+import argparse
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import fakes  # noqa: E402  (저장소 모듈은 캐시 폴더를 정한 뒤 main 에서 불러옴)
+
+SCENARIOS = {}
+
+
+def scenario(fn):
+    SCENARIOS[fn.__name__] = fn
+    return fn
+
+
+class Env:
+    """대역 객체와 합성 데이터. install() 이후 clients 의 생성 함수가 대역을 돌려줍니다."""
+
+    def __init__(self, args):
+        from settings import folder_ids
+        self.args = args
+        self.folder_ids = dict(folder_ids)
+        self.teams = list(self.folder_ids)
+        self.team = self.teams[0]
+        self.latency = fakes.Latency(sheets=args.sheets_latency, google=args.google_latency,
+                                     openai=args.openai_latency)
+        print(f"🧪 합성 시트 {args.rows}행, 회의록 {args.transcript_chars}자 생성 중...")
+        self.sheet_rows = fakes.make_sheet_rows(self.teams, args.rows, args.transcript_chars)
+        self.worksheet = fakes.FakeWorksheet(fakes.HEADER, self.sheet_rows, self.latency)
+        self.gc = fakes.FakeGspreadClient(self.worksheet)
+        self.drive, self.docs = fakes.make_drive(self.folder_ids, args.docs_per_team, args.transcript_chars,
+                                                 self.latency)
+        self.openai = fakes.FakeOpenAI(self.latency)
+
+    def install(self):
+        import clients
+        clients.sheets_client = lambda creds_json: self.gc
+        clients.drive_service = lambda creds_json: self.drive
+        clients.docs_service = lambda creds_json: self.docs
+        clients.openai_client = lambda api_key: self.openai
+
+
+def app_workdir():
+    """AppTest 를 실행할 작업 폴더. app.py 는 fonts/malgun.ttf 를 작업 폴더 기준으로 읽습니다.
+
+    저장소에 폰트가 없으면(배포 환경에서만 추가) matplotlib 기본 폰트를 그 이름으로 복사한 임시 폴더를 씁니다.
+    """
+    if os.path.exists(os.path.join(ROOT, "fonts", "malgun.ttf")):
+        return ROOT
+    import shutil
+    from matplotlib import font_manager
+    workdir = tempfile.mkdtemp(prefix="gyogong-bench-app-")
+    os.makedirs(os.path.join(workdir, "fonts"))
+    shutil.copy(font_manager.findfont("DejaVu Sans"), os.path.join(workdir, "fonts", "malgun.ttf"))
+    return workdir
+
+
+def timed(fn, *args, **kwargs):
+    start = time.perf_counter()
+    fn(*args, **kwargs)
+    return time.perf_counter() - start
+
+
+# ✅ 시나리오: 각 함수는 {이름: (실행별 소요 시간 목록, 처리 건수)} 를 반환
+@scenario
+def history_load(env):
+    from history_cache import HistoryCache
+    from results_store import ResultsStore
+    from settings import cache_path
+    cold, warm, tail = [], [], []
+    for n in range(env.args.repeat):
+        # 매번 빈 저장소에서 시작 (첫 화면 = 시트 전체 읽기)
+        store = ResultsStore(cache_path("bench", f"history-{n}-{time.time_ns()}.db"))
+        cache = HistoryCache(lambda: env.worksheet, store=store)
+        cold.append(timed(cache.team_history, env.team))
+        warm.append(timed(cache.team_history, env.team))
+        env.worksheet.append_rows(fakes.make_sheet_rows(env.teams, 10, env.args.transcript_chars, seed=n + 100))
+        cache.invalidate()
+        tail.append(timed(cache.team_history, env.team))
+    return {
+        "history_load.cold": (cold, env.args.rows),
+        "history_load.warm": (warm, env.args.rows),
+        "history_load.tail": (tail, 10),
+    }
+
+
+@scenario
+def display_dashboard(env):
+    import dashboard
+    creds_json = json.dumps({"type": "service_account"})
+    runs = [timed(dashboard.display_dashboard, creds_json, env.team) for _ in range(env.args.repeat)]
+    return {"display_dashboard": (runs, 1)}
+
+
+def _app_test(env):
+    from streamlit.testing.v1 import AppTest
+    os.chdir(env.workdir)
+    at = AppTest.from_file(os.path.join(ROOT, "app.py"), default_timeout=env.args.app_timeout)
+    at.secrets["google"] = {"GOOGLE_SERVICE_ACCOUNT": json.dumps({"type": "service_account"})}
+    at.secrets["OPENAI_API_KEY"] = "bench"
+    at.session_state["authenticated"] = True
+    at.session_state["is_admin"] = False
+    at.session_state["team_name"] = env.team
+    return at
+
+
+def _check(at):
+    if at.exception:
+        raise RuntimeError(at.exception[0].message)
+
+
+@scenario
+def app_page(env):
+    runs = []
+    for _ in range(env.args.repeat):
+        at = _app_test(env)
+        runs.append(timed(at.run))
+        _check(at)
+    return {"app_page": (runs, 1)}
+
+
+@scenario
+def app_analyze(env):
+    at = _app_test(env)
+    at.run()
+    _check(at)
+    files = env.drive.folders[env.folder_ids[env.team]]
+    runs = []
+    for n in range(env.args.repeat):
+        # 매번 처음 분석하는 회차를 골라 OpenAI 호출/저장까지 모두 거치게 함
+        picker = next(s for s in at.selectbox if s.label == "📝 회의록 회차 선택")
+        picker.set_value(files[n % len(files)]["name"])
+        at.run()
+        button = next(b for b in at.button if b.label == "🔍 회의록 분석 시작")
+        start = time.perf_counter()
+        button.click().run()
+        _check(at)
+        _wait_job(at)
+        runs.append(time.perf_counter() - start)
+    return {"app_analyze": (runs, 1)}
+
+
+def _wait_job(at, timeout=120):
+    # 분석은 작업 대기열에서 실행되므로 클릭 이후 작업이 끝날 때까지 기다리고, 실패하면 예외
+    from job_queue import DONE, FAILED, shared_jobs
+    job_id = at.session_state["analysis_job"]
+    deadline = time.monotonic() + timeout
+    while True:
+        job = shared_jobs().status(job_id)
+        if job["status"] == DONE:
+            return job
+        if job["status"] == FAILED:
+            raise RuntimeError(f"분석 작업 실패: {job['error']}")
+        if time.monotonic() > deadline:
+            raise RuntimeError(f"분석 작업이 {timeout}초 안에 끝나지 않았습니다: {job['status']}")
+        time.sleep(0.05)
+
+
+def _batch(env):
+    # docs_analyze 가 대역 클라이언트와 임시 서비스 계정 파일을 쓰도록 설정
+    import docs_analyze as batch
+    from settings import cache_path
+    key_file = cache_path("bench", "service-account.json")
+    with open(key_file, "w", encoding="utf-8") as f:
+        json.dump({"type": "service_account"}, f)
+    batch.KEY_FILE = key_file
+    batch.drive_service = lambda creds_json: env.drive
+    batch.docs_service = lambda creds_json: env.docs
+    batch.sheets_client = lambda creds_json: env.gc
+    batch.client = env.openai
+    return batch
+
+
+@scenario
+def docs_analyze(env):
+    from settings import cache_path
+    batch = _batch(env)
+    checkpoint = cache_path("bench", f"checkpoint-{time.time_ns()}.jsonl")
+    docs = len(env.teams) * env.args.docs_per_team
+    # 첫 실행은 모든 회의록 분석, 이후 실행은 새 회의록이 없을 때(모두 건너뜀)의 비용
+    first = timed(batch.run_batch, env.teams, checkpoint_path=checkpoint)
+    again = [timed(batch.run_batch, env.teams, checkpoint_path=checkpoint) for _ in range(env.args.repeat - 1)]
+    return {"docs_analyze.all": ([first], docs), "docs_analyze.no_new": (again or [first], docs)}
+
+
+@scenario
+def docs_analyze_fresh_cache(env):
+    """시트에는 분석 결과가 이미 있고 .cache 만 빈 경우 (새 서버, 캐시 삭제).
+
+    체크포인트와 로컬 저장소가 모두 비어 있어도 시트에 있는 회의록은 건너뛰어야 하므로,
+    OpenAI 를 다시 호출하거나 시트에 같은 행을 또 추가하면 예외를 냅니다.
+    """
+    from history_cache import HistoryCache
+    from results_store import ResultsStore
+    from settings import cache_path
+    from sheet_writer import start_writer
+    batch = _batch(env)
+    shared_history = batch.shared_history
+    # 먼저 모든 회의록이 시트에 저장돼 있도록 한 번 실행 (이미 있으면 건너뜀)
+    batch.run_batch(env.teams, checkpoint_path=cache_path("bench", f"checkpoint-{time.time_ns()}.jsonl"))
+
+    runs = []
+    for n in range(env.args.repeat):
+        fresh_dir = tempfile.mkdtemp(prefix="gyogong-bench-fresh-")
+        fresh = HistoryCache(lambda: env.worksheet, store=ResultsStore(os.path.join(fresh_dir, "results.db")))
+        fresh.writer = start_writer(fresh)
+        batch.shared_history = lambda gc: fresh
+        rows, calls = len(env.worksheet.rows), env.latency.calls.get("openai", 0)
+        try:
+            runs.append(timed(batch.run_batch, env.teams, checkpoint_path=os.path.join(fresh_dir, "checkpoint.jsonl")))
+        finally:
+            batch.shared_history = shared_history
+        added, analyzed = len(env.worksheet.rows) - rows, env.latency.calls.get("openai", 0) - calls
+        if added or analyzed:
+            raise RuntimeError(f"빈 캐시에서 이미 저장된 회의록을 다시 분석함 (OpenAI 호출 {analyzed}건, 시트 행 {added}건 추가)")
+    return {"docs_analyze.fresh_cache": (runs, len(env.teams) * env.args.docs_per_team)}
+
+
+def summarize(runs, items):
+    ordered = sorted(runs)
+    p95 = ordered[min(len(ordered) - 1, int(round(0.95 * (len(ordered) - 1))))]
+    median = statistics.median(runs)
+    return {"runs": len(runs), "first": runs[0], "p50": median, "p95": p95,
+            "throughput": items / median if median else None, "items": items}
+
+
+def report(results, baseline, tolerance):
+    regressions = []
+    print(f"\n{'시나리오':<24} {'횟수':>4} {'첫 실행(s)':>10} {'p50(s)':>9} {'p95(s)':>9} {'처리량(건/s)':>12} {'기준 대비':>10}")
+    for name, r in results.items():
+        change = ""
+        base = (baseline or {}).get(name)
+        if base and base.get("p50"):
+            ratio = r["p50"] / base["p50"] - 1
+            change = f"{ratio:+.0%}"
+            if ratio > tolerance:
+                regressions.append(name)
+                change += " ❌"
+        throughput = f"{r['throughput']:.1f}" if r["throughput"] else "-"
+        print(f"{name:<24} {r['runs']:>4} {r['first']:>10.3f} {r['p50']:>9.3f} {r['p95']:>9.3f} {throughput:>12} {change:>10}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=3000, help="합성 시트 행 수")
+    parser.add_argument("--docs-per-team", type=int, default=5, help="팀 폴더별 회의록 문서 수")
+    parser.add_argument("--transcript-chars", type=int, default=20000, help="회의록 길이(자)")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--sheets-latency", type=float, default=0.3, help="시트 호출 지연(초)")
+    parser.add_argument("--google-latency", type=float, default=0.15, help="Drive/Docs 호출 지연(초)")
+    parser.add_argument("--openai-latency", type=float, default=1.0, help="OpenAI 응답 지연(초)")
+    parser.add_argument("--app-timeout", type=float, default=120, help="AppTest 한 번 실행 제한 시간(초)")
+    parser.add_argument("--scenario", action="append", choices=list(SCENARIOS), help="실행할 시나리오 (기본: 전체)")
+    parser.add_argument("--cache-dir", help="캐시 폴더 (기본: 새 임시 폴더)")
+    parser.add_argument("--save", help="결과를 JSON 으로 저장")
+    parser.add_argument("--baseline", help="비교할 이전 결과 JSON")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="허용하는 p50 증가 비율")
+    args = parser.parse_args()
+
+    # 저장소 모듈을 불러오기 전에 캐시 폴더를 정해야 실제 .cache 를 건드리지 않음
+    os.environ["GYOGONG_CACHE_DIR"] = args.cache_dir or tempfile.mkdtemp(prefix="gyogong-bench-")
+    os.environ.setdefault("OPENAI_API_KEY", "bench")
+    print(f"📁 캐시 폴더: {os.environ['GYOGONG_CACHE_DIR']}")
+
+    env = Env(args)
+    env.install()
+    env.workdir = app_workdir()
+    started = time.time()
+
+    results, failed = {}, []
+    for name in args.scenario or list(SCENARIOS):
+        print(f"▶️ {name}")
+        try:
+            for key, (runs, items) in SCENARIOS[name](env).items():
+                results[key] = summarize(runs, items)
+        except ImportError as e:
+            print(f"   ⏭️ 건너뜀 (패키지 없음: {e.name})")
+        except Exception as e:
+            failed.append(name)
+            print(f"   ❌ 실패: {e!r}")
+
+    baseline = None
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)["results"]
+    regressions = report(results, baseline, args.tolerance)
+
+    from tracing import shared_log, stage_stats
+    stages = stage_stats([r for r in shared_log().snapshot() if r.get("ts", 0) >= started])
+    if not stages.empty:
+        print("\n⏱️ 단계별 소요 시간 (tracing span)")
+        print(stages.to_string(index=False))
+    print(f"\n📞 대역 호출 수: {json.dumps(env.latency.calls, ensure_ascii=False)}")
+
+    if args.save:
+        with open(args.save, "w", encoding="utf-8") as f:
+            json.dump({"args": vars(args), "results": results}, f, ensure_ascii=False, indent=2)
+    if failed:
+        print(f"\n❌ 실패한 시나리오: {', '.join(failed)}")
+    if regressions:
+        print(f"\n❌ 기준보다 {args.tolerance:.0%} 이상 느려진 시나리오: {', '.join(regressions)}")
+    if failed or regressions:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+"""분석 결과 파서(feedback.extract_structured_feedback) 골든 출력 확인 + 마이크로 벤치마크.
+
+    python benchmarks/bench_feedback_parser.py [--repeat N]
+
+golden/feedback/*.txt 응답을 파싱해 같은 이름의 .json 과 비교하고(스트리밍 파서 포함),
+응답 길이를 늘려 가며 이전 방식(항목마다 split 반복)과 처리 시간을 비교합니다.
+골든 출력과 다르면 종료 코드 1을 반환합니다.
+"""
+import argparse
+import glob
+import json
+import os
+import random
+import sys
+import timeit
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from feedback import SECTION_KEYS, SectionStream, extract_structured_feedback  # noqa: E402
+
+GOLDEN_DIR = os.path.join(ROOT, "benchmarks", "golden", "feedback")
+
+
+def legacy_extract(text):
+    # 이전 구현: 항목마다 전체 문자열을 split 하고 나머지를 다른 항목으로 다시 split
+    result = {k: "" for k in SECTION_KEYS}
+    for k in SECTION_KEYS:
+        if k in text:
+            after = text.split(k)[1]
+            for other in SECTION_KEYS:
+                if other != k and other in after:
+                    after = after.split(other)[0]
+            result[k] = after.strip()
+    return result
+
+
+def stream_parse(text, seed):
+    rng = random.Random(seed)
+    stream, i = SectionStream(), 0
+    while i < len(text):
+        n = rng.randint(1, 12)
+        stream.feed(text[i:i + n])
+        i += n
+    parsed, _ = stream.finish()
+    return parsed
+
+
+def check_golden():
+    failures = 0
+    paths = sorted(glob.glob(os.path.join(GOLDEN_DIR, "*.txt")))
+    for path in paths:
+        with open(path, encoding="utf-8") as f:
+            text = f.read()
+        with open(path[:-4] + ".json", encoding="utf-8") as f:
+            expected = json.load(f)
+        name = os.path.basename(path)
+        for label, actual in [("batch", extract_structured_feedback(text))] + [
+            (f"stream#{seed}", stream_parse(text, seed)) for seed in range(5)
+        ]:
+            if actual != expected:
+                failures += 1
+                diff = {k: (expected.get(k), actual.get(k)) for k in SECTION_KEYS if expected.get(k) != actual.get(k)}
+                print(f"❌ {name} [{label}] {json.dumps(diff, ensure_ascii=False)}")
+    print(f"골든 출력 {len(paths)}건 확인, 불일치 {failures}건")
+    return failures == 0
+
+
+def bench(repeat):
+    with open(os.path.join(GOLDEN_DIR, "plain.txt"), encoding="utf-8") as f:
+        base = f.read()
+    print(f"\n{'본문 배수':>8} {'길이(자)':>10} {'legacy(ms)':>12} {'new(ms)':>10} {'stream(ms)':>11}")
+    for scale in (1, 10, 100, 1000):
+        # 각 항목 본문을 scale배로 늘린 응답
+        lines = []
+        for line in base.splitlines():
+            lines.append(line)
+            if line and not line.endswith(":"):
+                lines.extend([line] * (scale - 1))
+        text = "\n".join(lines)
+        legacy = timeit.timeit(lambda: legacy_extract(text), number=repeat) / repeat * 1000
+        new = timeit.timeit(lambda: extract_structured_feedback(text), number=repeat) / repeat * 1000
+        stream = timeit.timeit(lambda: stream_parse(text, 0), number=max(1, repeat // 10)) / max(1, repeat // 10) * 1000
+        print(f"{scale:>8} {len(text):>10} {legacy:>12.3f} {new:>10.3f} {stream:>11.3f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=50)
+    args = parser.parse_args()
+    ok = check_golden()
+    bench(args.repeat)
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,246 @@
+"""벤치마크용 로컬 대역(fake): gspread, Drive/Docs discovery 클라이언트, OpenAI chat API + 합성 데이터.
+
+실제 API 대신 메모리 데이터를 돌려주고, 호출마다 지정한 지연 시간(초)만큼 기다려
+네트워크 왕복을 흉내 냅니다. 저장소 모듈은 불러오지 않습니다 (캐시 폴더 설정 전에 import 되므로).
+"""
+import json
+import os
+import random
+import re
+import threading
+import time
+from types import SimpleNamespace
+
+GOLDEN_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "golden", "feedback")
+
+HEADER = [
+    "시간", "팀명", "회의록 제목",
+    "역할 정리", "자기조절", "메타인지", "정서적 피드백", "개선 제안", "진행 요약", "다음 회의 제안",
+    "전체 회의록",
+]
+
+SPEAKERS = ["김민수", "이서연", "박지훈", "최유진", "정하늘", "한도윤"]
+WORDS = [
+    "수업", "설계", "목표", "학습자", "활동", "평가", "기준", "자료", "발표", "준비", "역할", "분담",
+    "일정", "마감", "피드백", "수정", "초안", "검토", "아이디어", "토론", "질문", "정리", "보고서", "계획",
+    "교수", "전략", "협동", "모둠", "단계", "도입", "전개", "마무리", "성찰", "동기", "흥미", "참여",
+    "과제", "분석", "결과", "개선", "제안", "의견", "공유", "확인", "완료", "진행", "회의", "다음",
+    "지난번", "이번", "정말", "좋아요", "그러면", "일단", "제가", "우리", "같이", "먼저", "나중에", "해볼게요",
+]
+
+
+def make_transcript(rng, chars):
+    """화자 이름이 붙은 긴 한국어 회의록 (대략 chars 글자)."""
+    lines, size = [], 0
+    while size < chars:
+        sentence = " ".join(rng.choice(WORDS) for _ in range(rng.randint(6, 18))) + "."
+        line = f"{rng.choice(SPEAKERS)}: {sentence}"
+        lines.append(line)
+        size += len(line) + 1
+    return "\n".join(lines)
+
+
+def make_sheet_rows(teams, rows, transcript_chars, seed=0):
+    """팀별로 번갈아 가며 쌓인 분석 결과 시트 행 (헤더 제외)."""
+    rng = random.Random(seed)
+    start = time.mktime((2024, 3, 1, 9, 0, 0, 0, 0, -1))
+    values = []
+    for i in range(rows):
+        team = teams[i % len(teams)]
+        stamp = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(start + i * 3600))
+        sections = [f"{key} 내용 {i} " + " ".join(rng.choice(WORDS) for _ in range(20)) for key in HEADER[3:10]]
+        values.append([stamp, team, f"{team} {i // len(teams) + 1}회차 회의록", *sections,
+                       make_transcript(rng, transcript_chars)])
+    return values
+
+
+def canned_analysis_text():
+    with open(os.path.join(GOLDEN_DIR, "plain.txt"), encoding="utf-8") as f:
+        return f.read()
+
+
+class Latency:
+    """호출 종류별 지연 시간(초). 호출 수도 함께 셉니다."""
+
+    def __init__(self, **seconds):
+        self.seconds = seconds
+        self.calls = {}
+        self._lock = threading.Lock()
+
+    def wait(self, kind):
+        with self._lock:
+            self.calls[kind] = self.calls.get(kind, 0) + 1
+        delay = self.seconds.get(kind, 0)
+        if delay:
+            time.sleep(delay)
+
+
+# ✅ gspread
+class FakeWorksheet:
+    def __init__(self, header, rows, latency):
+        self.rows = [list(header)] + [list(r) for r in rows]
+        self.latency = latency
+        self._lock = threading.Lock()
+
+    def get_all_values(self):
+        self.latency.wait("sheets")
+        with self._lock:
+            return [list(r) for r in self.rows]
+
+    def get(self, range_name):
+        # "A{start}:{마지막 열}" 형식만 지원 (HistoryCache 의 이어 읽기)
+        self.latency.wait("sheets")
+        start = int(re.match(r"[A-Z]+(\d+)", range_name).group(1))
+        with self._lock:
+            return [list(r) for r in self.rows[start - 1:]]
+
+    def append_rows(self, values, **kwargs):
+        self.latency.wait("sheets")
+        with self._lock:
+            self.rows.extend(list(v) for v in values)
+
+
+class FakeGspreadClient:
+    def __init__(self, worksheet):
+        self.sheet1 = worksheet
+
+    def open_by_key(self, key):
+        return self
+
+
+# ✅ Drive / Docs (googleapiclient 호출 형태)
+class _Request:
+    def __init__(self, fn):
+        self._fn = fn
+
+    def execute(self, http=None, num_retries=0):
+        return self._fn(True)
+
+
+class FakeDrive:
+    PAGE = 100
+
+    def __init__(self, folders, latency):
+        # folders: {folder_id: [{"id", "name", "createdTime", "modifiedTime"}]}
+        self.folders = folders
+        self.latency = latency
+
+    def files(self):
+        return self
+
+    def list(self, q, pageSize=100, pageToken=None, fields=None):
+        def run(wait):
+            if wait:
+                self.latency.wait("google")
+            folder_id = re.match(r"'([^']+)' in parents", q).group(1)
+            since = re.search(r"modifiedTime >= '([^']+)'", q)
+            files = [f for f in self.folders.get(folder_id, [])
+                     if not since or f["modifiedTime"] >= since.group(1)]
+            start = int(pageToken or 0)
+            size = min(pageSize or self.PAGE, self.PAGE)
+            result = {"files": files[start:start + size]}
+            if start + size < len(files):
+                result["nextPageToken"] = str(start + size)
+            return result
+        return _Request(run)
+
+    def new_batch_http_request(self, callback):
+        return FakeBatch(callback, self.latency)
+
+
+class FakeBatch:
+    def __init__(self, callback, latency):
+        self.callback = callback
+        self.latency = latency
+        self.requests = []
+
+    def add(self, request, request_id=None):
+        self.requests.append((request_id, request))
+
+    def execute(self, http=None):
+        # 배치 한 번 = 왕복 한 번
+        self.latency.wait("google")
+        for request_id, request in self.requests:
+            self.callback(request_id, request._fn(False), None)
+
+
+class FakeDocs:
+    def __init__(self, texts, latency):
+        self.texts = texts  # {doc_id: 본문}
+        self.latency = latency
+
+    def documents(self):
+        return self
+
+    def get(self, documentId):
+        def run(wait):
+            if wait:
+                self.latency.wait("google")
+            content = [{"paragraph": {"elements": [{"textRun": {"content": line + "\n"}}]}}
+                       for line in self.texts[documentId].split("\n")]
+            return {"revisionId": "r1", "body": {"content": content}}
+        return _Request(run)
+
+
+def make_drive(folder_ids, docs_per_team, transcript_chars, latency, seed=1):
+    """팀 폴더마다 회의록 문서를 만든 FakeDrive, FakeDocs."""
+    rng = random.Random(seed)
+    folders, texts = {}, {}
+    for team, folder_id in folder_ids.items():
+        files = []
+        for n in range(1, docs_per_team + 1):
+            doc_id = f"{folder_id}-doc{n}"
+            stamp = f"2024-04-{n % 28 + 1:02d}T10:00:00.000Z"
+            files.append({"id": doc_id, "name": f"{team} 회의록 {n}회차", "createdTime": stamp, "modifiedTime": stamp})
+            texts[doc_id] = make_transcript(rng, transcript_chars)
+        folders[folder_id] = files
+    return FakeDrive(folders, latency), FakeDocs(texts, latency)
+
+
+# ✅ OpenAI chat API
+class FakeOpenAI:
+    """``client.chat.completions.create`` 만 흉내 냅니다 (일반/스트리밍, usage 포함).
+
+    분석 요청에는 골든 분석 응답을, 기여도 요청에는 JSON + 해석을, 그 밖에는 짧은 요약을 돌려줍니다.
+    """
+
+    def __init__(self, latency, stream_chunks=40):
+        self.latency = latency
+        self.stream_chunks = stream_chunks
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self.create))
+        self.analysis_text = canned_analysis_text()
+
+    def _reply(self, messages):
+        system = messages[0]["content"] if messages and messages[0]["role"] == "system" else ""
+        # 분석 시스템 프롬프트에도 "팀원별 기여도" 라는 말이 있으므로 기여도 전문가 프롬프트로 구분
+        if "기여도를 분석" in system:
+            names = SPEAKERS[:3]
+            return json.dumps({n: p for n, p in zip(names, (45, 35, 20))}, ensure_ascii=False) + \
+                "\n" + " ".join(f"{n}는 회의 진행에 참여했습니다." for n in names)
+        if "자기조절" in system or "역할 정리" in system:
+            return self.analysis_text
+        return "회의 내용을 요약한 짧은 응답입니다. " + " ".join(WORDS[:20])
+
+    def _usage(self, messages, text):
+        prompt = sum(len(m["content"]) for m in messages)
+        return SimpleNamespace(prompt_tokens=prompt // 2, completion_tokens=len(text) // 2)
+
+    def create(self, model, messages, stream=False, timeout=None, stream_options=None, **params):
+        text = self._reply(messages)
+        usage = self._usage(messages, text)
+        if not stream:
+            self.latency.wait("openai")
+            return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=text))], usage=usage)
+        return self._stream(text, usage)
+
+    def _stream(self, text, usage):
+        # 전체 지연 시간을 조각 수만큼 나눠 흘려보냄
+        total = self.latency.seconds.get("openai", 0)
+        self.latency.wait("openai_stream")
+        size = max(1, len(text) // self.stream_chunks)
+        for i in range(0, len(text), size):
+            if total:
+                time.sleep(total / self.stream_chunks)
+            delta = SimpleNamespace(content=text[i:i + size])
+            yield SimpleNamespace(choices=[SimpleNamespace(delta=delta)], usage=None)
+        yield SimpleNamespace(choices=[], usage=usage)
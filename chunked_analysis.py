@@ -0,0 +1,140 @@
+import contextvars
+from concurrent.futures import ThreadPoolExecutor
+
+from feedback import SECTION_KEYS, SYSTEM_PROMPT
+from llm_cache import cached_completion
+from rate_limit import estimate_tokens
+
+try:
+    import tiktoken
+except ImportError:  # tiktoken이 없으면 글자 수 기반 추정치 사용
+    tiktoken = None
+
+# ✅ 한 번의 분석 요청에 넣을 최대 프롬프트 토큰 수 (넘으면 나눠서 분석)
+MAX_PROMPT_TOKENS = 12_000
+
+# ✅ 나눠서 분석할 때 조각 크기/겹치는 분량(토큰)과 동시에 보낼 요청 수
+CHUNK_TOKENS = 4_000
+OVERLAP_TOKENS = 300
+CHUNK_WORKERS = 4
+
+# ✅ 조각 분석에 사용할 모델
+MAP_MODEL = "gpt-4-turbo"
+
+# ✅ 조각별 정리를 합친 결과도 한도를 넘으면 다시 나눠 정리하는 최대 횟수 (그래도 넘으면 뒷부분을 자름)
+MAX_REDUCE_ROUNDS = 2
+
+MAP_PROMPT = f"""
+당신은 긴 팀 회의록을 여러 부분으로 나누어 먼저 정리하는 조력자입니다.
+주어진 부분만 보고 아래 7가지 영역별로 관찰된 사실과 발언자 이름, 구체적인 예시를 요점으로 정리하세요.
+해당 부분에서 드러나지 않은 영역은 "해당 없음"이라고 적으세요. 평가나 제안은 하지 말고 관찰 내용만 적으세요.
+
+{chr(10).join(f"{k}:" for k in SECTION_KEYS)}
+"""
+
+_encoders = {}
+
+
+def count_tokens(text, model="gpt-4-turbo"):
+    if tiktoken is None:
+        return estimate_tokens(text)
+    encoder = _encoders.get(model)
+    if model not in _encoders:
+        try:
+            try:
+                encoder = tiktoken.encoding_for_model(model)
+            except KeyError:
+                encoder = tiktoken.get_encoding("cl100k_base")
+        except Exception as e:  # 인코딩 파일을 받을 수 없는 환경(오프라인 등) → 추정치 사용
+            print(f"⚠️ tiktoken 인코딩을 불러오지 못해 토큰 수를 추정합니다: {e}")
+            encoder = None
+        _encoders[model] = encoder
+    if encoder is None:
+        return estimate_tokens(text)
+    return len(encoder.encode(text or "", disallowed_special=()))
+
+
+def _split_long_line(line, tokens, limit):
+    # 한 줄이 조각 크기보다 길면 글자 수 비율로 자름
+    size = max(1, len(line) * limit // max(tokens, 1))
+    return [line[i:i + size] for i in range(0, len(line), size)]
+
+
+def split_into_chunks(text, chunk_tokens=CHUNK_TOKENS, overlap_tokens=OVERLAP_TOKENS):
+    """줄 단위로 ``chunk_tokens`` 이하 조각을 만들고, 앞 조각의 마지막 줄들을 ``overlap_tokens`` 만큼 겹칩니다."""
+    lines = []
+    for line in text.splitlines(keepends=True):
+        tokens = count_tokens(line)
+        if tokens > chunk_tokens:
+            lines.extend((part, count_tokens(part)) for part in _split_long_line(line, tokens, chunk_tokens))
+        else:
+            lines.append((line, tokens))
+
+    chunks, current, used = [], [], 0
+    for line, tokens in lines:
+        if current and used + tokens > chunk_tokens:
+            chunks.append("".join(l for l, _ in current))
+            # 다음 조각은 이전 조각 끝부분을 조금 포함해 문맥이 끊기지 않게 함
+            carried, carried_tokens = [], 0
+            for prev in reversed(current):
+                if carried_tokens + prev[1] > overlap_tokens:
+                    break
+                carried.insert(0, prev)
+                carried_tokens += prev[1]
+            current, used = carried, carried_tokens
+        current.append((line, tokens))
+        used += tokens
+    if current:
+        chunks.append("".join(l for l, _ in current))
+    return chunks
+
+
+def _analysis_messages(context_summary, meeting_text):
+    return [
+        {"role": "system", "content": SYSTEM_PROMPT},
+        {"role": "user", "content": f"[과거 회의 요약]\n{context_summary}\n\n[이번 회의 내용]\n{meeting_text}"}
+    ]
+
+
+def _map_chunk(client, index, total, chunk, limiter, timeout):
+    messages = [
+        {"role": "system", "content": MAP_PROMPT},
+        {"role": "user", "content": f"[회의록 {index}/{total} 부분]\n{chunk}"}
+    ]
+    # 한도는 캐시에 없어 실제로 호출할 때만 차감
+    return cached_completion(client, model=MAP_MODEL, messages=messages, timeout=timeout, limiter=limiter)
+
+
+def build_analysis_messages(client, meeting_text, context_summary, max_prompt_tokens=MAX_PROMPT_TOKENS,
+                            chunk_tokens=CHUNK_TOKENS, overlap_tokens=OVERLAP_TOKENS, max_workers=CHUNK_WORKERS,
+                            limiter=None, timeout=None):
+    """최종 분석 요청 메시지를 만듭니다.
+
+    프롬프트가 ``max_prompt_tokens`` 안에 들어가면 기존과 같은 메시지를 그대로 반환하고,
+    넘으면 회의록을 겹치는 조각으로 나눠 동시에 정리(map)한 뒤, 조각별 정리를 합쳐
+    7가지 영역 형식으로 분석하도록 하는 메시지(reduce)를 반환합니다.
+    합친 정리도 한도를 넘으면 ``MAX_REDUCE_ROUNDS`` 번까지 다시 나눠 정리하고, 그래도 넘으면 한도에 맞게 자릅니다.
+    """
+    text = meeting_text
+    for _ in range(MAX_REDUCE_ROUNDS):
+        messages = _analysis_messages(context_summary, text)
+        if sum(count_tokens(m["content"]) for m in messages) <= max_prompt_tokens:
+            return messages
+
+        chunks = split_into_chunks(text, chunk_tokens, overlap_tokens)
+        context = contextvars.copy_context()  # 조각 요청의 토큰 사용량도 같은 팀으로 기록
+        with ThreadPoolExecutor(max_workers=max_workers) as pool:
+            notes = list(pool.map(
+                lambda args: context.copy().run(_map_chunk, client, args[0], len(chunks), args[1], limiter, timeout),
+                enumerate(chunks, 1)
+            ))
+        summary = "\n\n".join(f"[회의록 {i}/{len(chunks)} 부분 정리]\n{note}" for i, note in enumerate(notes, 1))
+        text = f"(긴 회의록을 {len(chunks)}개 부분으로 나누어 정리한 내용입니다)\n\n{summary}"
+
+    messages = _analysis_messages(context_summary, text)
+    overflow = sum(count_tokens(m["content"]) for m in messages) - max_prompt_tokens
+    if overflow > 0:
+        # 남은 한도만큼 앞부분만 사용 (줄 단위로 자름)
+        budget = max(1, count_tokens(text) - overflow)
+        messages = _analysis_messages(context_summary, split_into_chunks(text, budget, 0)[0])
+    return messages
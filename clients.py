@@ -0,0 +1,144 @@
+import hashlib
+import json
+import queue
+import threading
+from contextlib import contextmanager
+
+# ✅ 구글 API 권한 범위
+SCOPES = [
+    'https://www.googleapis.com/auth/spreadsheets',
+    'https://www.googleapis.com/auth/drive.readonly',
+    'https://www.googleapis.com/auth/documents.readonly'
+]
+
+# ✅ 구글 API용 HTTP 연결 풀 크기 (동시에 요청할 수 있는 최대 연결 수)
+HTTP_POOL_SIZE = 16
+HTTP_TIMEOUT = 60
+
+_clients = {}
+_locks = {}
+_http_pools = {}
+_registry_lock = threading.Lock()
+
+
+def _cached(key, factory):
+    # 키마다 한 번만 생성 (다른 키 생성은 막지 않음)
+    with _registry_lock:
+        if key in _clients:
+            return _clients[key]
+        lock = _locks.setdefault(key, threading.Lock())
+    with lock:
+        if key not in _clients:
+            _clients[key] = factory()
+        return _clients[key]
+
+
+def _fingerprint(text):
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def google_credentials(creds_json, scopes=SCOPES):
+    from google.oauth2 import service_account
+    return _cached(
+        ("credentials", _fingerprint(creds_json), tuple(scopes)),
+        lambda: service_account.Credentials.from_service_account_info(json.loads(creds_json), scopes=scopes),
+    )
+
+
+def sheets_client(creds_json):
+    def factory():
+        import gspread
+        from requests.adapters import HTTPAdapter
+        gc = gspread.authorize(google_credentials(creds_json))
+        # requests 세션 연결 풀을 키워 여러 세션이 동시에 써도 keep-alive 연결을 재사용
+        session = getattr(getattr(gc, "http_client", None), "session", None) or getattr(gc, "session", None)
+        if session is not None:
+            adapter = HTTPAdapter(pool_connections=HTTP_POOL_SIZE, pool_maxsize=HTTP_POOL_SIZE)
+            session.mount("https://", adapter)
+        return gc
+    return _cached(("sheets", _fingerprint(creds_json)), factory)
+
+
+class _HttpPool:
+    """AuthorizedHttp 연결 풀. httplib2.Http 는 스레드 안전하지 않으므로 요청마다 하나씩 빌려 씀."""
+
+    def __init__(self, credentials, size=HTTP_POOL_SIZE):
+        self.credentials = credentials
+        self._idle = queue.LifoQueue()
+        self._slots = threading.BoundedSemaphore(size)
+
+    def acquire(self):
+        import google_auth_httplib2
+        import httplib2
+        self._slots.acquire()
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            return google_auth_httplib2.AuthorizedHttp(self.credentials, http=httplib2.Http(timeout=HTTP_TIMEOUT))
+
+    def release(self, http):
+        self._idle.put(http)
+        self._slots.release()
+
+
+def _pooled_request_builder(pool):
+    from googleapiclient.http import HttpRequest
+
+    class PooledHttpRequest(HttpRequest):
+        def execute(self, http=None, num_retries=0):
+            if http is not None:
+                return super().execute(http=http, num_retries=num_retries)
+            conn = pool.acquire()
+            try:
+                return super().execute(http=conn, num_retries=num_retries)
+            finally:
+                pool.release(conn)
+
+    return PooledHttpRequest
+
+
+def _google_service(creds_json, name, version):
+    def factory():
+        from googleapiclient.discovery import build
+        pool = _HttpPool(google_credentials(creds_json))
+        http = pool.acquire()
+        pool.release(http)
+        # 패키지에 포함된 discovery 문서를 사용해 네트워크 요청 없이 생성
+        service = build(name, version, http=http, requestBuilder=_pooled_request_builder(pool),
+                        static_discovery=True)
+        _http_pools[id(service)] = pool
+        return service
+    return _cached((name, version, _fingerprint(creds_json)), factory)
+
+
+@contextmanager
+def borrowed_http(service):
+    """서비스의 연결 풀에서 연결 하나를 빌림 (BatchHttpRequest.execute(http=...) 용).
+
+    풀을 쓰지 않는 서비스면 None 을 돌려주므로 execute 기본 동작을 그대로 따릅니다.
+    """
+    pool = _http_pools.get(id(service))
+    if pool is None:
+        yield None
+        return
+    http = pool.acquire()
+    try:
+        yield http
+    finally:
+        pool.release(http)
+
+
+def drive_service(creds_json):
+    return _google_service(creds_json, "drive", "v3")
+
+
+def docs_service(creds_json):
+    return _google_service(creds_json, "docs", "v1")
+
+
+def openai_client(api_key):
+    def factory():
+        import openai
+        # OpenAI 클라이언트는 내부 httpx 연결 풀을 쓰며 여러 스레드에서 함께 사용해도 안전
+        return openai.OpenAI(api_key=api_key)
+    return _cached(("openai", _fingerprint(api_key)), factory)
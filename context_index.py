@@ -0,0 +1,108 @@
+import math
+import threading
+from collections import Counter
+
+from chunked_analysis import count_tokens
+from token_index import clean_korean_text
+from transcript_store import content_hash
+
+# ✅ 분석 프롬프트의 [과거 회의 요약]에 넣을 최대 토큰 수
+CONTEXT_TOKENS = 1_500
+
+# ✅ 과거 회의마다 함께 보여 줄 이전 피드백 항목
+CONTEXT_SECTIONS = ["진행 요약", "다음 회의 제안"]
+
+# ✅ 점수 = 관련도(TF-IDF 코사인) × RELEVANCE_WEIGHT + 최근성 × (1 - RELEVANCE_WEIGHT)
+RELEVANCE_WEIGHT = 0.6
+
+# ✅ 최근성 점수가 절반이 되는 회의 수 (가장 최근 회의 = 1)
+RECENCY_HALF_LIFE = 3
+
+
+def _block(time_value, title, sections):
+    lines = [f"[{time_value[:16]}] {title}"]
+    lines += [f"- {key}: {value.strip()}" for key, value in zip(CONTEXT_SECTIONS, sections) if value.strip()]
+    return "\n".join(lines)
+
+
+def _weights(counts, idf):
+    # 로그 빈도 × idf (긴 회의록에서 자주 나온 단어가 점수를 독차지하지 않도록)
+    weights = {w: (1 + math.log(n)) * idf.get(w, 0.0) for w, n in counts.items()}
+    norm = math.sqrt(sum(v * v for v in weights.values())) or 1.0
+    return {w: v / norm for w, v in weights.items()}
+
+
+class ContextIndex:
+    """팀별 과거 피드백(진행 요약/다음 회의 제안) 색인.
+
+    결과 저장소에 새로 들어온 행만 ``sync`` 로 추가하고, 이번 회의록과 관련이 크고
+    최근인 항목을 토큰 한도 안에서 골라 ``[과거 회의 요약]`` 문자열을 만듭니다.
+    """
+
+    def __init__(self):
+        self._teams = {}       # 팀 → {(시간, 제목): 항목}
+        self._last_row_id = 0
+        self._lock = threading.Lock()
+
+    def _add(self, team_name, time_value, title, digest, sections):
+        entries = self._teams.setdefault(team_name, {})
+        entries.pop((time_value, title), None)  # 시트를 다시 읽어 같은 행이 새 id 로 들어온 경우
+        if not any(s.strip() for s in sections):
+            return
+        block = _block(time_value, title, sections)
+        counts = Counter(clean_korean_text(" ".join(sections)))
+        entries[(time_value, title)] = {"time": time_value, "title": title, "hash": digest, "block": block,
+                                        "counts": counts, "tokens": count_tokens(block)}
+
+    def sync(self, store):
+        # 결과 저장소에 새로 들어온 행만 색인
+        rows = store.sections_after(self._last_row_id, CONTEXT_SECTIONS)
+        with self._lock:
+            for row_id, team_name, time_value, title, digest, *sections in rows:
+                self._add(team_name, time_value, title, digest, sections)
+                self._last_row_id = max(self._last_row_id, row_id)
+
+    def select(self, team_name, text, title=None, budget=CONTEXT_TOKENS):
+        """이번 회의록(text, 제목 title)에 대한 과거 회의 요약 문자열 (오래된 순, ``budget`` 토큰 이하).
+
+        이번 회의록 자신(같은 제목 또는 같은 본문)의 이전 분석은 제외하고, 이미 저장된 회의록을
+        다시 분석하는 경우에는 그 회의 이후의 항목도 제외합니다 (다시 분석해도 같은 프롬프트가 되도록).
+        """
+        digest = content_hash(text)
+        with self._lock:
+            entries = sorted(self._teams.get(team_name, {}).values(), key=lambda e: e["time"])
+        own = [e["time"] for e in entries if e["hash"] == digest or (title and e["title"] == title)]
+        if own:
+            entries = [e for e in entries if e["time"] < min(own)]
+        if not entries:
+            return ""
+        # 문서 빈도는 후보 항목만으로 계산 (이후에 저장된 회의가 점수를 바꾸지 않도록)
+        df = Counter(w for e in entries for w in e["counts"])
+        idf = {w: math.log((1 + len(entries)) / (1 + n)) + 1 for w, n in df.items() if n > 0}
+        query = _weights(Counter(w for w in clean_korean_text(text) if w in idf), idf)
+
+        scored = []
+        for rank, entry in enumerate(reversed(entries)):
+            doc = _weights(entry["counts"], idf)
+            relevance = sum(v * doc.get(w, 0.0) for w, v in query.items())
+            recency = 0.5 ** (rank / RECENCY_HALF_LIFE)
+            scored.append((RELEVANCE_WEIGHT * relevance + (1 - RELEVANCE_WEIGHT) * recency, entry))
+
+        chosen, used = [], 0
+        for _, entry in sorted(scored, key=lambda s: s[0], reverse=True):
+            if used + entry["tokens"] <= budget:
+                chosen.append(entry)
+                used += entry["tokens"]
+        return "\n\n".join(e["block"] for e in sorted(chosen, key=lambda e: e["time"]))
+
+
+_shared = None
+_shared_lock = threading.Lock()
+
+
+def shared_context():
+    global _shared
+    with _shared_lock:
+        if _shared is None:
+            _shared = ContextIndex()
+        return _shared
@@ -1,43 +1,38 @@
-from google.oauth2 import service_account
-from googleapiclient.discovery import build
-import openai
 from dotenv import load_dotenv
+import argparse
+import json
 import os
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from transcripts import fetch_transcript
+from feedback import build_result_row, extract_structured_feedback
+from chunked_analysis import build_analysis_messages
+from history_cache import shared_history
+from clients import docs_service, drive_service, openai_client, sheets_client
+from drive_listing import shared_listing
+from llm_cache import cached_completion
+from rate_limit import shared_limiter
+from results_store import content_hash
+from settings import cache_path, folder_ids
+from tracing import span, team_context
+from workers import ANALYSIS_TIMEOUT
 
 # 환경 변수 불러오기
 load_dotenv()
-client = openai.OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+client = openai_client(os.getenv("OPENAI_API_KEY"))
 
 # 문서 ID
 DOCUMENT_ID = "19PY1QoY8OP9gfJLTmwFywakoJEPEhxzXpsX75ernoyI"
 
-# Google Docs API 연결
-SCOPES = ['https://www.googleapis.com/auth/documents.readonly']
-creds = service_account.Credentials.from_service_account_file(
-    'gyogong-sheets-key.json', scopes=SCOPES)
-service = build('docs', 'v1', credentials=creds)
-
-# 문서 불러오기
-doc = service.documents().get(documentId=DOCUMENT_ID).execute()
-doc_content = doc.get("body").get("content")
-
-# 본문 텍스트 추출
-def extract_text(elements):
-    text = ''
-    for v in elements:
-        if 'paragraph' in v:
-            for elem in v['paragraph']['elements']:
-                if 'textRun' in elem:
-                    text += elem['textRun']['content']
-    return text
-
-meeting_text = extract_text(doc_content)
-
-# GPT에 분석 요청
-response = client.chat.completions.create(
-    model="gpt-4",
-    messages=[
-        {"role": "system", "content": """
+# Google API 연결 정보 (권한 범위는 clients.SCOPES)
+KEY_FILE = 'gyogong-sheets-key.json'
+
+# ✅ 일괄 분석 설정
+CHECKPOINT_PATH = cache_path("batch_checkpoint.jsonl")
+FETCH_WORKERS = 8
+ANALYSIS_WORKERS = 4
+
+SINGLE_PROMPT = """
 당신은 팀 프로젝트 회의록을 분석하는 교육용 챗봇입니다. 아래 회의 내용을 보고 다음을 알려주세요:
 
 1. 발언자별 역할 정리
@@ -45,10 +40,154 @@ response = client.chat.completions.create(
 3. 참여도 분석 (소극적 참여자, 리더 역할 등)
 4. 전체 프로젝트 흐름에서 현재 단계 진단
 5. 긍정적인 피드백과 개선 제안
-"""},
-        {"role": "user", "content": meeting_text}
-    ]
-)
+"""
+
+
+def _creds_json():
+    with open(KEY_FILE, encoding="utf-8") as f:
+        return f.read()
+
+
+# ✅ 문서 하나 분석 (기존 동작, 일괄 분석과 같은 공유 클라이언트/응답 캐시/기록 사용)
+def analyze_single(document_id):
+    docs = docs_service(_creds_json())
+
+    # 문서 불러오기 + 본문 텍스트 추출 (app.py와 같은 추출기 사용)
+    with span("docs_fetch"):
+        meeting_text = fetch_transcript(docs, document_id)
+
+    # GPT에 분석 요청 (같은 본문을 다시 분석하면 캐시된 응답 사용)
+    with span("analysis"):
+        result = cached_completion(
+            client,
+            model="gpt-4",
+            messages=[
+                {"role": "system", "content": SINGLE_PROMPT},
+                {"role": "user", "content": meeting_text}
+            ],
+            timeout=ANALYSIS_TIMEOUT,
+            limiter=shared_limiter(),
+        )
+
+    print("📋 회의록 분석 결과:\n")
+    print(result)
+
+
+class Checkpoint:
+    """분석을 마친 (문서 ID, 본문 해시)를 한 줄씩 기록해 중단 후 이어서 실행할 수 있게 합니다."""
+
+    def __init__(self, path=CHECKPOINT_PATH):
+        self.path = path
+        self._lock = threading.Lock()
+        self.done = set()
+        if os.path.exists(path):
+            with open(path, encoding="utf-8") as f:
+                for line in f:
+                    if line.strip():
+                        entry = json.loads(line)
+                        self.done.add((entry["doc_id"], entry["hash"]))
+
+    def __contains__(self, key):
+        return key in self.done
+
+    def add(self, doc_id, digest, team_name):
+        with self._lock:
+            self.done.add((doc_id, digest))
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write(json.dumps({"doc_id": doc_id, "hash": digest, "team": team_name}, ensure_ascii=False) + "\n")
+
+
+def analyze_meeting(limiter, team_name, context_summary, meeting_text):
+    with team_context(team_name):
+        # 긴 회의록은 조각별 정리(map) 요청도 같은 한도 안에서 실행
+        with span("chunk_map"):
+            messages = build_analysis_messages(client, meeting_text, context_summary, limiter=limiter, timeout=ANALYSIS_TIMEOUT)
+        # 모든 작업자가 하나의 분당 요청/토큰 한도를 나눠 씀 (캐시에 없어 실제로 호출할 때만 차감)
+        with span("analysis"):
+            return cached_completion(client, model="gpt-4-turbo", messages=messages, timeout=ANALYSIS_TIMEOUT,
+                                     limiter=limiter)
+
+
+def _fetch(docs, team_name, f):
+    with team_context(team_name), span("docs_fetch"):
+        return fetch_transcript(docs, f["id"], f.get("modifiedTime"))
+
+
+# ✅ 모든 팀 폴더 일괄 분석
+def run_batch(teams, workers=ANALYSIS_WORKERS, checkpoint_path=CHECKPOINT_PATH, dry_run=False):
+    # 공유 클라이언트는 요청마다 연결 풀에서 연결을 빌려 쓰므로 여러 스레드에서 함께 사용
+    creds_json = _creds_json()
+    drive, docs = drive_service(creds_json), docs_service(creds_json)
+    history = shared_history(sheets_client(creds_json))
+    checkpoint = Checkpoint(checkpoint_path)
+    limiter = shared_limiter()
+
+    # 1️⃣ 팀 폴더 목록은 한 번의 배치 요청으로, 회의록 본문은 동시에 가져오기
+    with span("drive_list"):
+        listings = shared_listing().all_folders(drive, {team: folder_ids[team] for team in teams})
+    jobs = [(team, f) for team in teams for f in listings[team]]
+    with ThreadPoolExecutor(max_workers=FETCH_WORKERS) as pool:
+        texts = list(pool.map(
+            lambda job: _fetch(docs, *job), jobs
+        ))
+
+    # 2️⃣ 이미 분석한 본문은 건너뛰기 (체크포인트 + 저장소의 팀/제목/본문 해시 색인)
+    pending, skipped = [], 0
+    for (team, f), text in zip(jobs, texts):
+        digest = content_hash(text)
+        if not text.strip() or (f["id"], digest) in checkpoint or history.is_duplicate(team, f["name"], text):
+            skipped += 1
+            continue
+        pending.append((team, f, text, digest))
+    print(f"📂 회의록 {len(jobs)}건 중 {len(pending)}건 분석 예정 ({skipped}건 건너뜀)")
+    if dry_run or not pending:
+        return
+
+    # 3️⃣ 제한된 작업자 수로 분석 → 결과는 로컬 저장소에 먼저 기록
+    # 과거 회의 요약은 회의록마다 관련 있는 이전 피드백을 토큰 한도 안에서 골라 만듦
+    failed = 0
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        futures = {
+            pool.submit(analyze_meeting, limiter, team, history.context_summary(team, text, f["name"]), text): (team, f, text, digest)
+            for team, f, text, digest in pending
+        }
+        for i, future in enumerate(as_completed(futures), 1):
+            team, f, text, digest = futures[future]
+            try:
+                with team_context(team), span("parse"):
+                    parsed = extract_structured_feedback(future.result())
+            except Exception as e:
+                failed += 1
+                print(f"❌ [{i}/{len(futures)}] {team} / {f['name']}: {e}")
+                continue
+            history.store.add_result(build_result_row(team, f["name"], parsed, text))
+            checkpoint.add(f["id"], digest, team)
+            print(f"✅ [{i}/{len(futures)}] {team} / {f['name']}")
+
+    # 4️⃣ 모인 결과를 append_rows 배치로 한 번에 시트에 반영
+    with span("sheet_save"):
+        flushed = history.writer.flush()
+    if flushed:
+        print(f"📌 시트 저장 완료 (실패 {failed}건은 다시 실행하면 이어서 분석합니다)")
+    else:
+        print(f"⚠️ 시트 저장 실패: {history.writer.last_error} (로컬 저장소에 보관, 다음 실행 때 전송)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="회의록 분석 (단일 문서 / 전체 팀 일괄)")
+    parser.add_argument("--batch", action="store_true", help="모든 팀 폴더의 회의록을 일괄 분석")
+    parser.add_argument("--team", action="append", choices=list(folder_ids), help="일괄 분석할 팀 (여러 번 지정 가능)")
+    parser.add_argument("--workers", type=int, default=ANALYSIS_WORKERS, help="동시에 실행할 분석 작업 수")
+    parser.add_argument("--checkpoint", default=CHECKPOINT_PATH, help="이어서 실행하기 위한 체크포인트 파일")
+    parser.add_argument("--dry-run", action="store_true", help="분석 대상만 확인")
+    parser.add_argument("--document", default=DOCUMENT_ID, help="단일 분석할 문서 ID")
+    args = parser.parse_args()
+
+    if args.batch:
+        run_batch(args.team or list(folder_ids), args.workers, args.checkpoint, args.dry_run)
+    else:
+        analyze_single(args.document)
+
 
-print("📋 회의록 분석 결과:\n")
-print(response.choices[0].message.content)
\ No newline at end of file
+if __name__ == "__main__":
+    main()
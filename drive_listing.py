@@ -0,0 +1,158 @@
+import json
+import os
+import threading
+import time
+
+from clients import borrowed_http
+from settings import cache_path
+
+LISTING_DIR = cache_path("drive", "")
+
+# ✅ 이 시간(초) 안에는 다시 묻지 않고 캐시된 목록을 그대로 사용
+REFRESH_INTERVAL = 60
+
+# ✅ 삭제/이동된 문서를 반영하기 위해 이 시간(초)마다 폴더 전체를 다시 나열
+FULL_REFRESH_INTERVAL = 600
+
+PAGE_SIZE = 1000
+BATCH_LIMIT = 100  # Drive 배치 요청 한 번에 담을 수 있는 최대 호출 수
+
+DOC_QUERY = "'{folder_id}' in parents and mimeType='application/vnd.google-apps.document'"
+FIELDS = "nextPageToken, files(id, name, createdTime, modifiedTime, trashed)"
+
+
+def _query(folder_id, since=None):
+    q = DOC_QUERY.format(folder_id=folder_id)
+    if since:
+        # 휴지통으로 옮긴 문서도 modifiedTime 이 바뀌므로 trashed 필터 없이 받아서 제거
+        return q + f" and modifiedTime >= '{since}'"
+    return q + " and trashed = false"
+
+
+def _list_request(drive, q, page_token=None):
+    return drive.files().list(q=q, pageSize=PAGE_SIZE, pageToken=page_token, fields=FIELDS)
+
+
+def _list_pages(drive, q, first=None):
+    # 첫 페이지(배치로 이미 받은 응답)가 있으면 이어서 다음 페이지만 요청
+    results = first if first is not None else _list_request(drive, q).execute()
+    files = list(results.get("files", []))
+    while results.get("nextPageToken"):
+        results = _list_request(drive, q, results["nextPageToken"]).execute()
+        files.extend(results.get("files", []))
+    return files
+
+
+class DriveListing:
+    """팀 폴더별 회의록 목록 캐시 (메모리 + .cache/drive/<folder_id>.json).
+
+    처음과 FULL_REFRESH_INTERVAL 마다 폴더 전체를 나열하고, 그 사이에는
+    마지막으로 본 modifiedTime 이후에 추가/수정된 문서만 받아 합칩니다.
+    """
+
+    def __init__(self, directory=LISTING_DIR, refresh_interval=REFRESH_INTERVAL,
+                 full_refresh_interval=FULL_REFRESH_INTERVAL):
+        self.directory = directory
+        self.refresh_interval = refresh_interval
+        self.full_refresh_interval = full_refresh_interval
+        self._entries = {}
+        self._checked = {}
+        self._lock = threading.Lock()
+
+    def _path(self, folder_id):
+        return os.path.join(self.directory, f"{folder_id}.json")
+
+    def _entry(self, folder_id):
+        entry = self._entries.get(folder_id)
+        if entry is None and os.path.exists(self._path(folder_id)):
+            with open(self._path(folder_id), encoding="utf-8") as f:
+                entry = self._entries[folder_id] = json.load(f)
+        return entry
+
+    def _plan(self, folder_id, force=False):
+        """새로 요청할 쿼리를 반환합니다. 캐시가 아직 유효하면 None."""
+        with self._lock:
+            entry = self._entry(folder_id)
+            checked = self._checked.get(folder_id, 0)
+        now = time.time()
+        if entry is None or now - entry["full_at"] >= self.full_refresh_interval:
+            return _query(folder_id), True
+        if force or now - checked >= self.refresh_interval:
+            return _query(folder_id, entry["cursor"]), False
+        return None
+
+    def _merge(self, folder_id, files, full):
+        with self._lock:
+            entry = None if full else self._entry(folder_id)
+            if entry is None:
+                entry = {"files": {}, "cursor": None, "full_at": time.time()}
+            for f in files:
+                if f.get("trashed"):
+                    entry["files"].pop(f["id"], None)
+                else:
+                    entry["files"][f["id"]] = {k: f.get(k) for k in ("id", "name", "createdTime", "modifiedTime")}
+            times = [f["modifiedTime"] for f in entry["files"].values() if f.get("modifiedTime")]
+            entry["cursor"] = max(times + [entry["cursor"] or ""]) or None
+            self._entries[folder_id] = entry
+            self._checked[folder_id] = time.time()
+            tmp = self._path(folder_id) + ".tmp"
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(entry, f, ensure_ascii=False)
+            os.replace(tmp, self._path(folder_id))
+
+    def _files(self, folder_id):
+        with self._lock:
+            files = list(self._entry(folder_id)["files"].values())
+        return sorted(files, key=lambda x: x["createdTime"])
+
+    def files(self, drive, folder_id, force=False):
+        """폴더의 회의록 목록 (createdTime 순). 모든 페이지를 합친 결과입니다."""
+        plan = self._plan(folder_id, force)
+        if plan is not None:
+            q, full = plan
+            self._merge(folder_id, _list_pages(drive, q), full)
+        return self._files(folder_id)
+
+    def all_folders(self, drive, folder_ids, force=False):
+        """여러 팀 폴더를 한 번의 배치 요청으로 갱신해 {팀명: 목록} 을 반환합니다."""
+        plans = {team: self._plan(fid, force) for team, fid in folder_ids.items()}
+        stale = [(team, folder_ids[team], plan) for team, plan in plans.items() if plan is not None]
+        for i in range(0, len(stale), BATCH_LIMIT):
+            chunk = stale[i:i + BATCH_LIMIT]
+            responses, errors = {}, {}
+
+            def callback(request_id, response, exception):
+                if exception is not None:
+                    errors[request_id] = exception
+                else:
+                    responses[request_id] = response
+
+            batch = drive.new_batch_http_request(callback=callback)
+            for n, (_, fid, (q, _)) in enumerate(chunk):
+                batch.add(_list_request(drive, q), request_id=str(n))
+            with borrowed_http(drive) as http:
+                batch.execute(http=http)
+
+            for n, (team, fid, (q, full)) in enumerate(chunk):
+                if str(n) in errors:
+                    # 배치 안에서 실패한 폴더만 개별 요청으로 다시 시도
+                    files = _list_pages(drive, q)
+                else:
+                    files = _list_pages(drive, q, responses[str(n)])
+                self._merge(fid, files, full)
+        return {team: self._files(fid) for team, fid in folder_ids.items()}
+
+    def invalidate(self, folder_id=None):
+        # 다음 조회 때 증분 갱신 (folder_id 가 없으면 전체)
+        with self._lock:
+            if folder_id is None:
+                self._checked.clear()
+            else:
+                self._checked.pop(folder_id, None)
+
+
+_shared = DriveListing()
+
+
+def shared_listing():
+    return _shared
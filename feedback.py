@@ -0,0 +1,181 @@
+import re
+from datetime import datetime
+
+# ✅ 시스템 프롬프트
+SYSTEM_PROMPT = """
+당신은 교육공학 기반의 협력학습을 지원하는 지능형 피드백 챗봇입니다.
+이 팀은 중등 교사 대상 원격 직무연수 콘텐츠인 「에듀테크 활용 PBL 수업 실천법」을 설계하고 있으며,
+학생들은 실제 교육 현장에서 적용 가능한 수업 사례가 포함된 강의 콘텐츠를 개발해야 합니다.
+
+본 프로젝트는 다음 평가 기준에 기반하여 수행됩니다. 회의 내용을 분석할 때 이 기준과 부합하는지 판단하고, 그에 따른 분석과 피드백을 제공하세요:
+
+[과제 평가 기준]
+1. 과정 적합성: 콘텐츠 흐름과 컨셉이 ‘중등교사 대상 PBL 수업 실천 연수’에 적절한가?
+2. 사례의 구체성과 정확성: 제시된 수업 사례가 교과 및 학습자 맥락에 맞고, 교육적 타당성을 갖추었는가?
+3. 적용 가능성: 교사가 실제 적용 가능한 구체성과 현실성을 갖추었는가?
+4. 콘텐츠 구조 및 흐름: 강의의 전체 구성과 흐름이 논리적이고 자연스러운가?
+5. 내용 전달력: 교사가 듣고 쉽게 이해하고 따라할 수 있도록 구성되었는가?
+
+다음 7가지 영역에 따라 회의 내용을 분석하세요. 각 항목 이름을 그대로 소제목으로 사용하여 구분하세요.
+피드백을 제공할 때는 분석 결과를 기반으로하여 '팀원별 기여도', '잘한 점', '개선할 점', '다음 회의 제안'을 요약 포인트로 작성해서 제공하세요.
+각 항목은 1~2문장 이내로 간결하게 작성하되, 구체적인 예시를 포함하세요.
+
+7가지 분석 영역:
+1. 역할 정리: 누가 어떤 역할을 수행했는지, 각 팀원의 역할이 명확하게 정리되었는지 판단하세요. 역할 분담의 균형 여부와 팀워크 협력 수준을 분석하세요.
+2. 자기조절: 회의 과정에서 목표 설정, 작업 계획 수립, 일정 조율 등의 자기조절 전략이 어떻게 실행되었는지 확인하세요. 계획과 실행 사이의 조정 과정도 포함하세요.
+3. 메타인지: 팀이 현재 프로젝트 단계와 목표를 명확히 인식하고 있는지, 이를 바탕으로 전략적 사고(문제 해결 접근법, 조정 제안 등)가 이루어졌는지 판단하세요.
+4. 정서적 피드백: 회의 분위기와 팀원 간 정서적 상호작용(격려, 공감, 긍정적 피드백 등)을 분석하고, 팀의 몰입 및 동기 유발을 촉진하는 상호작용이 있었는지 평가하세요.
+5. 개선 제안: 현재 논의 및 작업의 부족한 점을 구체적으로 도출하고, 팀원들이 이를 인식하고 개선 방안을 제시했는지, 피드백 수용 과정이 원활했는지를 평가하세요.
+6. 진행 요약: 이전 회의 대비 작업 진행 상황을 요약하고, 현재 목표 달성도 및 과업 성취 여부를 점검하세요. 진행 속도와 질적 수준 모두를 고려하세요.
+7. 다음 회의 제안: 다음 회의나 작업 단계에서 해결해야 할 핵심 과제, 실행 전략을 구체적으로 제시하세요. 다음 단계로의 연결성을 고려한 계획 수립 여부를 점검하세요.
+
+[응답 형식 예시]
+역할 정리:
+자기조절:
+메타인지:
+정서적 피드백:
+개선 제안:
+진행 요약:
+다음 회의 제안:
+"""
+
+# ✅ 시스템 프롬프트의 7가지 분석 영역 (응답 소제목 순서)
+SECTION_KEYS = ["역할 정리", "자기조절", "메타인지", "정서적 피드백", "개선 제안", "진행 요약", "다음 회의 제안"]
+
+
+# ✅ 소제목 패턴 (한 번만 컴파일)
+# 줄 맨 앞의 "역할 정리:", "**역할 정리**", "### 1. 역할 정리:", "역할 정리 (팀워크)", "1. 역할 정리 - 내용"
+# 같은 형태를 소제목으로 보고, 본문 중간에 나오는 "개선 제안" 같은 단어는 소제목으로 보지 않음.
+# 마크다운 제목(### ...)은 항목 이름 뒤에 한글이 아닌 문자로 시작하는 말이 붙어 있어도 소제목으로 보고,
+# 항목 이름이 아닌 마크다운 제목과 구분선(---)은 앞 항목의 끝으로만 사용.
+# 이미 나온 항목 이름은 _HeaderFilter 에서 한 번 더 거름
+_KEY_ALT = "|".join(re.escape(k) for k in SECTION_KEYS)
+_DECOR = r"(?:\*\*|__)?"
+_LEAD = rf"{_DECOR}[ \t]*(?:\d+[.)][ \t]*)?{_DECOR}[ \t]*"
+_HEADER = re.compile(
+    rf"^[ \t]*#{{1,6}}[ \t]+{_LEAD}(?P<heading_key>{_KEY_ALT})(?![가-힣])(?![ \t]*{_DECOR}[ \t]*[:：]).*$"
+    rf"|^[ \t]*(?:#{{1,6}}[ \t]*)?(?:[-*+][ \t]+)?{_LEAD}"
+    rf"(?P<key>{_KEY_ALT})[ \t]*{_DECOR}[ \t]*(?:[(（][^)）\n]*[)）][ \t]*{_DECOR}[ \t]*)?"
+    rf"(?:[:：][ \t]*{_DECOR}|[-–—][ \t]+|$)"
+    rf"|^[ \t]*#{{1,6}}[ \t]+\S.*$"
+    rf"|^[ \t]*(?:-{{3,}}|\*{{3,}}|_{{3,}})[ \t]*$",
+    re.MULTILINE,
+)
+# 줄 맨 앞 소제목이 하나도 없을 때만 사용하는 예비 패턴 ("... 역할 정리: ..." 형태)
+_INLINE = re.compile(rf"(?P<key>{_KEY_ALT})[ \t]*{_DECOR}[ \t]*[:：][ \t]*{_DECOR}")
+
+
+def _iter_boundaries(pattern, text, pos=0, endpos=None):
+    for m in pattern.finditer(text, pos, len(text) if endpos is None else endpos):
+        groups = m.groupdict()
+        yield groups.get("key") or groups.get("heading_key"), m.start(), m.end()
+
+
+class _HeaderFilter:
+    """이미 나온 항목 이름은 마크다운 제목이거나 구분선/다른 제목 뒤에 올 때만 소제목으로 봅니다.
+
+    "다음 회의 제안" 본문 안의 "- 개선 제안: ..." 같은 줄이 새 소제목으로 잘려 나가지 않게 합니다.
+    스트리밍 파서는 조각마다 같은 객체를 이어서 사용합니다.
+    """
+
+    def __init__(self):
+        self.seen = set()
+        self.after_break = False
+
+    def __call__(self, text, boundaries):
+        for key, start, end in boundaries:
+            if key is None:
+                self.after_break = True
+            elif key in self.seen and not self.after_break and not text[start:end].lstrip().startswith("#"):
+                continue
+            else:
+                self.seen.add(key)
+                self.after_break = False
+            yield key, start, end
+
+
+def _closed_sections(text, boundaries):
+    # 다음 소제목이 이미 나온 항목만 (같은 항목이 여러 번 나오면 처음 것 사용)
+    sections = {}
+    for (key, _, end), (_, next_start, _) in zip(boundaries, boundaries[1:]):
+        if key and key not in sections:
+            sections[key] = text[end:next_start].strip()
+    return sections
+
+
+# ✅ 분석 결과 파싱 함수 (소제목 위치를 한 번 훑어 O(n)으로 나눔)
+def extract_structured_feedback(text):
+    boundaries = list(_HeaderFilter()(text, _iter_boundaries(_HEADER, text)))
+    if not any(key for key, _, _ in boundaries):
+        boundaries = list(_HeaderFilter()(text, _iter_boundaries(_INLINE, text)))
+    boundaries.append((None, len(text), len(text)))
+    result = {k: "" for k in SECTION_KEYS}
+    result.update(_closed_sections(text, boundaries))
+    return result
+
+
+class SectionStream:
+    """스트리밍 응답을 받으면서 완성된 항목을 순서대로 돌려줍니다.
+
+    새로 완성된 줄만 한 번씩 훑고 열린 항목의 본문 조각만 모아 두므로, 전체 처리량은
+    응답 길이에 비례합니다. ``feed`` 는 새로 완성된 (항목, 내용) 목록을 반환하고,
+    ``finish`` 는 나머지 항목까지 포함한 최종 결과를 반환합니다.
+    최종 결과는 ``extract_structured_feedback`` 과 같습니다.
+    """
+
+    def __init__(self):
+        self._chunks = []
+        self._pending = ""
+        self._open_key = None
+        self._open_parts = []
+        self._seen = set()
+        self._headers = _HeaderFilter()
+        self.done = {}
+
+    @property
+    def text(self):
+        return "".join(self._chunks)
+
+    def feed(self, delta):
+        if not delta:
+            return []
+        self._chunks.append(delta)
+        self._pending += delta
+        # 소제목 여부는 줄이 끝나야 확정되므로 완성된 줄까지만 확인
+        line_end = self._pending.rfind("\n") + 1
+        if not line_end:
+            return []
+        segment, self._pending = self._pending[:line_end], self._pending[line_end:]
+        completed = []
+        pos = 0
+        for key, start, end in self._headers(segment, _iter_boundaries(_HEADER, segment)):
+            if self._open_key is not None:
+                self._open_parts.append(segment[pos:start])
+                body = "".join(self._open_parts).strip()
+                self.done[self._open_key] = body
+                completed.append((self._open_key, body))
+            # 같은 항목이 다시 나오면 처음 것만 사용
+            self._open_key = key if key and key not in self._seen else None
+            self._seen.add(key)
+            self._open_parts = []
+            pos = end
+        if self._open_key is not None:
+            self._open_parts.append(segment[pos:])
+        return completed
+
+    def finish(self):
+        parsed = extract_structured_feedback(self.text)
+        remaining = [(k, parsed[k]) for k in SECTION_KEYS if k not in self.done and parsed[k]]
+        self.done.update(parsed)
+        return parsed, remaining
+
+
+def build_result_row(team_name, title, parsed, full_text=""):
+    # 시트 열 순서(settings.RESULT_COLUMNS)에 맞춘 저장용 행
+    return [
+        datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+        team_name,
+        title,
+        *[parsed.get(k, "") for k in SECTION_KEYS],
+        full_text,
+    ]
@@ -0,0 +1,153 @@
+import re
+import sqlite3
+import threading
+import zlib
+
+import numpy as np
+
+from results_store import content_hash
+from settings import cache_path
+
+DB_PATH = cache_path("fingerprints.db")
+
+# ✅ 이 값 이상이면 "거의 같은 회의록"으로 판단 (추정 자카드 유사도, 0~1)
+SIMILARITY_THRESHOLD = 0.8
+
+SHINGLE_SIZE = 5    # 글자 단위 shingle 길이 (한국어는 띄어쓰기가 들쭉날쭉해 글자 단위가 안정적)
+NUM_PERM = 128      # MinHash 서명 길이
+BANDS = 32          # LSH 밴드 수 (밴드당 NUM_PERM // BANDS 개) → 유사도 약 0.4 이상이 후보가 됨
+_ROWS = NUM_PERM // BANDS
+_CHUNK = 4096       # 한 번에 처리할 shingle 수 (메모리 사용량 제한)
+
+_PRIME = np.uint64((1 << 32) + 15)
+_MAX = np.uint64((1 << 64) - 1)
+_rng = np.random.RandomState(20240501)
+_A = _rng.randint(1, 1 << 31, size=NUM_PERM).astype(np.uint64)
+_B = _rng.randint(0, 1 << 31, size=NUM_PERM).astype(np.uint64)
+
+_SPACES = re.compile(r"\s+")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS signatures (hash TEXT PRIMARY KEY, signature BLOB NOT NULL);
+CREATE TABLE IF NOT EXISTS documents (hash TEXT NOT NULL, team TEXT NOT NULL, title TEXT NOT NULL,
+                                      PRIMARY KEY (hash, team, title));
+"""
+
+
+def shingles(text, k=SHINGLE_SIZE):
+    s = _SPACES.sub(" ", text or "").strip()
+    if len(s) <= k:
+        return {s} if s else set()
+    return {s[i:i + k] for i in range(len(s) - k + 1)}
+
+
+def signature(text):
+    """본문의 MinHash 서명 (NUM_PERM 개의 uint64). 빈 본문이면 None."""
+    hashes = np.fromiter((zlib.crc32(s.encode("utf-8")) for s in shingles(text)), dtype=np.uint64)
+    if hashes.size == 0:
+        return None
+    sig = np.full(NUM_PERM, _MAX, dtype=np.uint64)
+    for i in range(0, hashes.size, _CHUNK):
+        permuted = (np.outer(hashes[i:i + _CHUNK], _A) + _B) % _PRIME
+        np.minimum(sig, permuted.min(axis=0), out=sig)
+    return sig
+
+
+def _band_keys(sig):
+    return [zlib.crc32(sig[b * _ROWS:(b + 1) * _ROWS].tobytes()) for b in range(BANDS)]
+
+
+def estimate_similarity(a, b):
+    return float(np.mean(a == b))
+
+
+class FingerprintIndex:
+    """저장된 회의록 본문(해시)별 MinHash 서명과 LSH 버킷 색인 (메모리 + SQLite).
+
+    새 회의록과 같은 버킷에 걸린 본문만 비교하므로 이력 전체와 비교하지 않습니다.
+    """
+
+    def __init__(self, path=DB_PATH):
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.executescript(_SCHEMA)
+        self._lock = threading.Lock()
+        self._signatures = {}
+        self._documents = {}
+        self._buckets = [{} for _ in range(BANDS)]
+        self._last_row_id = 0
+        for digest, blob in self._conn.execute("SELECT hash, signature FROM signatures"):
+            self._remember(digest, np.frombuffer(blob, dtype=np.uint64))
+        for digest, team, title in self._conn.execute("SELECT hash, team, title FROM documents"):
+            self._documents.setdefault(digest, set()).add((team, title))
+
+    def _remember(self, digest, sig):
+        self._signatures[digest] = sig
+        for band, key in enumerate(_band_keys(sig)):
+            self._buckets[band].setdefault(key, set()).add(digest)
+
+    def add(self, team_name, title, text, digest=None):
+        digest = digest or content_hash(text)
+        with self._lock:
+            docs = self._documents.setdefault(digest, set())
+            if (team_name, title) in docs:
+                return
+            sig = None
+            if digest not in self._signatures:
+                sig = signature(text)
+                if sig is None:
+                    return
+                self._remember(digest, sig)
+            docs.add((team_name, title))
+            with self._conn:
+                if sig is not None:
+                    self._conn.execute("INSERT OR REPLACE INTO signatures (hash, signature) VALUES (?, ?)",
+                                       (digest, sig.tobytes()))
+                self._conn.execute("INSERT OR IGNORE INTO documents (hash, team, title) VALUES (?, ?, ?)",
+                                   (digest, team_name, title))
+
+    def sync(self, store):
+        # 결과 저장소에 새로 들어온 행만 색인 (이미 서명이 있는 본문은 다시 계산하지 않음)
+        for row_id, digest, team_name, title, ref in store.transcripts_after(self._last_row_id):
+            # 본문은 서명이 없는 해시만 압축 저장소에서 읽음
+            text = None if digest in self._signatures else store.transcript(ref)
+            self.add(team_name, title, text, digest)
+            self._last_row_id = max(self._last_row_id, row_id)
+
+    def similar(self, text, team_name=None, threshold=SIMILARITY_THRESHOLD, exclude=None):
+        """비슷한 회의록 목록 [{"팀명", "회의록 제목", "유사도"}] (유사도 높은 순).
+
+        team_name 이 없으면 모든 팀의 이력에서 찾습니다. exclude=(팀명, 제목) 은 지금 분석 중인
+        회의록으로 보고 결과에서 뺍니다 (다른 팀명으로 저장된 같은 제목·같은 본문도 제외).
+        """
+        sig = signature(text)
+        if sig is None:
+            return []
+        own_digest = content_hash(text)
+        exclude_title = exclude[1] if exclude else None
+        matches = []
+        with self._lock:
+            candidates = set()
+            for band, key in enumerate(_band_keys(sig)):
+                candidates |= self._buckets[band].get(key, set())
+            for digest in candidates:
+                score = estimate_similarity(sig, self._signatures[digest])
+                if score < threshold:
+                    continue
+                for team, title in self._documents.get(digest, ()):
+                    if (team, title) == exclude or (title == exclude_title and digest == own_digest):
+                        continue
+                    if team_name is None or team == team_name:
+                        matches.append({"팀명": team, "회의록 제목": title, "유사도": round(score, 3)})
+        return sorted(matches, key=lambda m: m["유사도"], reverse=True)
+
+
+_shared = None
+_shared_lock = threading.Lock()
+
+
+def shared_fingerprints():
+    global _shared
+    with _shared_lock:
+        if _shared is None:
+            _shared = FingerprintIndex()
+        return _shared
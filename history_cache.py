@@ -0,0 +1,150 @@
+import threading
+import time
+
+from gspread.utils import rowcol_to_a1
+
+from context_index import CONTEXT_TOKENS, shared_context
+from fingerprints import SIMILARITY_THRESHOLD, shared_fingerprints
+from results_store import ResultsStore
+from settings import SHEET_KEY
+from sheet_writer import start_writer
+from speaker_stats import shared_speakers
+from token_index import shared_index
+
+# ✅ 스냅샷을 다시 확인하기 전까지 로컬 데이터를 그대로 사용하는 시간(초)
+REFRESH_INTERVAL = 60
+
+
+class HistoryCache:
+    """구글시트 결과 시트의 로컬 스냅샷.
+
+    시트의 행은 ``ResultsStore`` (SQLite)에 색인해 두고, 이후에는 마지막으로
+    가져온 행 이후에 추가된 행만 요청합니다. 팀별 DataFrame은 저장소가
+    바뀔 때만 다시 만듭니다.
+    """
+
+    def __init__(self, open_worksheet, store=None, refresh_interval=REFRESH_INTERVAL):
+        self._open_worksheet = open_worksheet
+        self._worksheet = None
+        self.store = store or ResultsStore()
+        self.refresh_interval = refresh_interval
+        self._lock = threading.RLock()
+        self._checked_at = 0.0
+        self._stale = True
+        self._frames = {}
+        self._frames_version = None
+
+    @property
+    def worksheet(self):
+        with self._lock:
+            if self._worksheet is None:
+                self._worksheet = self._open_worksheet()
+            return self._worksheet
+
+    def invalidate(self):
+        # 저장 직후 호출 → 다음 조회 때 새로 추가된 행을 가져옴
+        with self._lock:
+            self._stale = True
+
+    def reload(self):
+        # 시트가 중간에 수정된 경우 전체 스냅샷을 다시 만듦
+        with self._lock:
+            self.store.reset_mirror()
+            self._refresh()
+
+    def _needs_refresh(self):
+        return self._stale or time.monotonic() - self._checked_at >= self.refresh_interval
+
+    def _refresh(self):
+        ws = self.worksheet
+        header = self.store.header
+        if not header:
+            values = ws.get_all_values()
+            header, new_rows = (values[0], values[1:]) if values else ([], [])
+        else:
+            # 헤더(1행) + 이미 가져온 행 다음부터만 요청
+            start = self.store.imported_rows + 2
+            last_col = rowcol_to_a1(1, len(header)).rstrip("0123456789")
+            new_rows = ws.get(f"A{start}:{last_col}")
+        if header:
+            self.store.import_sheet_rows(header, new_rows)
+        self._stale = False
+        self._checked_at = time.monotonic()
+
+    def team_history(self, team_name):
+        with self._lock:
+            if self._needs_refresh():
+                self._refresh()
+            if self._frames_version != self.store.version:
+                self._frames = {}
+                self._frames_version = self.store.version
+            frame = self._frames.get(team_name)
+            if frame is None:
+                frame = self._frames[team_name] = self.store.team_frame(team_name)
+        return frame.copy()
+
+    def is_duplicate(self, team_name, title, text):
+        # 빈 .cache 에서 처음 확인할 때도 시트에 이미 있는 행과 비교하도록 먼저 스냅샷을 가져옴
+        with self._lock:
+            if self._needs_refresh():
+                self._refresh()
+        return self.store.find_duplicate(team_name, title, text)
+
+    def all_history(self):
+        # 전체 팀 결과 (관리자 개요용)
+        with self._lock:
+            if self._needs_refresh():
+                self._refresh()
+        return self.store.all_frame()
+
+    def similar_meetings(self, team_name, text, threshold=SIMILARITY_THRESHOLD, exclude=None):
+        """저장된 이력에서 본문이 비슷한 회의록을 찾습니다 (team_name 이 None 이면 모든 팀).
+
+        exclude=(팀명, 제목) 은 지금 분석 중인 회의록 자신이므로 결과에서 뺍니다.
+        """
+        with self._lock:
+            if self._needs_refresh():
+                self._refresh()
+        index = shared_fingerprints()
+        index.sync(self.store)
+        return index.similar(text, team_name, threshold, exclude)
+
+    def context_summary(self, team_name, text, title=None, budget=CONTEXT_TOKENS):
+        """분석 프롬프트용 과거 회의 요약: 이번 회의록과 관련 있고 최근인 이전 피드백 (토큰 한도 이하).
+
+        이번 회의록(같은 제목/본문)의 이전 분석과 그 이후 회의는 제외합니다.
+        """
+        with self._lock:
+            if self._needs_refresh():
+                self._refresh()
+        index = shared_context()
+        index.sync(self.store)
+        return index.select(team_name, text, title, budget)
+
+
+_caches = {}
+_caches_lock = threading.Lock()
+
+
+def shared_history(gc, sheet_key=SHEET_KEY):
+    # ✅ 프로세스 전체에서 시트당 하나의 캐시를 공유 (Streamlit 세션 간 공유)
+    with _caches_lock:
+        cache = _caches.get(sheet_key)
+        if cache is None:
+            cache = HistoryCache(lambda: gc.open_by_key(sheet_key).sheet1)
+            cache.writer = start_writer(cache)
+            _caches[sheet_key] = cache
+        return cache
+
+
+def save_result(gc, values, latency=None):
+    # 로컬 저장소(저널)에 먼저 기록하고, 시트 반영은 write-behind 작업자에 맡김
+    cache = shared_history(gc)
+    cache.store.add_result(values, latency)
+    cache.writer.notify()
+    # 대시보드 키워드용 토큰 색인과 발화 통계도 저장 시점에 미리 계산
+    shared_index().entries([values[-1]])
+    shared_speakers().summaries([values[-1]])
+    # 다음 분석의 과거 회의 요약에 방금 저장한 피드백이 바로 반영되도록 색인
+    shared_context().sync(cache.store)
+    shared_fingerprints().add(values[1], values[2], values[-1])
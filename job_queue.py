@@ -0,0 +1,188 @@
+import json
+import sqlite3
+import threading
+import time
+import uuid
+
+from settings import cache_path
+from tracing import team_context
+
+DB_PATH = cache_path("jobs.db")
+
+# ✅ 동시에 실행하는 분석 작업 수 (프로세스 전체)
+JOB_WORKERS = 4
+
+# ✅ 팀별로 동시에 실행할 수 있는 작업 수 (나머지는 대기열에서 순서를 기다림)
+TEAM_CONCURRENCY = 1
+
+QUEUED, RUNNING, DONE, FAILED = "queued", "running", "done", "failed"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id TEXT PRIMARY KEY,
+    team TEXT NOT NULL,
+    title TEXT NOT NULL,
+    status TEXT NOT NULL,
+    created_at REAL NOT NULL,
+    started_at REAL,
+    finished_at REAL,
+    result TEXT,
+    error TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_jobs_team_title ON jobs(team, title, created_at);
+"""
+
+_FIELDS = ["id", "team", "title", "status", "created_at", "started_at", "finished_at", "result", "error"]
+
+
+class JobStore:
+    """분석 작업 상태/결과를 보관하는 SQLite 테이블. 새로고침하거나 다른 세션에서도 다시 읽을 수 있습니다."""
+
+    def __init__(self, path=DB_PATH):
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(_SCHEMA)
+        self._lock = threading.Lock()
+
+    def _row(self, row):
+        if row is None:
+            return None
+        job = dict(zip(_FIELDS, row))
+        job["result"] = json.loads(job["result"]) if job["result"] else None
+        return job
+
+    def insert(self, job):
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT INTO jobs (id, team, title, status, created_at) VALUES (?, ?, ?, ?, ?)",
+                (job["id"], job["team"], job["title"], job["status"], job["created_at"]),
+            )
+
+    def update(self, job_id, **fields):
+        if "result" in fields:
+            fields["result"] = json.dumps(fields["result"], ensure_ascii=False)
+        with self._lock, self._conn:
+            self._conn.execute(
+                f"UPDATE jobs SET {', '.join(f'{k} = ?' for k in fields)} WHERE id = ?", [*fields.values(), job_id]
+            )
+
+    def get(self, job_id):
+        with self._lock:
+            return self._row(self._conn.execute(
+                f"SELECT {', '.join(_FIELDS)} FROM jobs WHERE id = ?", (job_id,)
+            ).fetchone())
+
+    def latest(self, team_name, title):
+        with self._lock:
+            return self._row(self._conn.execute(
+                f"SELECT {', '.join(_FIELDS)} FROM jobs WHERE team = ? AND title = ? ORDER BY created_at DESC LIMIT 1",
+                (team_name, title),
+            ).fetchone())
+
+    def mark_interrupted(self):
+        # 이전 프로세스에서 끝나지 않은 작업 (실행 함수는 저장되지 않으므로 다시 실행할 수 없음)
+        with self._lock, self._conn:
+            self._conn.execute(
+                "UPDATE jobs SET status = ?, error = ?, finished_at = ? WHERE status IN (?, ?)",
+                (FAILED, "서버가 다시 시작되어 작업이 중단되었습니다. 다시 분석해주세요.", time.time(), QUEUED, RUNNING),
+            )
+
+
+class JobQueue:
+    """프로세스 전체에서 공유하는 분석 작업 대기열 + 작업자 스레드.
+
+    작업 함수는 ``fn(report, *args, **kwargs)`` 형태로 호출되며, ``report(**진행상황)`` 으로
+    넘긴 값은 메모리에만 보관해 화면에서 진행 상황을 보여 줄 때 씁니다.
+    반환값(JSON 으로 저장 가능한 dict)은 저장소에 기록됩니다. 작업자 스레드에서는 st.* 를 호출하지 않습니다.
+    """
+
+    def __init__(self, store=None, workers=JOB_WORKERS, team_limit=TEAM_CONCURRENCY):
+        self.store = store or JobStore()
+        self.store.mark_interrupted()
+        self.team_limit = team_limit
+        self._cond = threading.Condition()
+        self._queue = []       # 대기 중인 작업 id (들어온 순서)
+        self._jobs = {}        # id → 실행 정보 (fn, args, kwargs, progress)
+        self._running = {}     # 팀 → 실행 중인 작업 수
+        for n in range(workers):
+            threading.Thread(target=self._work, daemon=True, name=f"analysis-job-{n}").start()
+
+    def submit(self, team_name, title, fn, /, *args, **kwargs):
+        """작업을 대기열에 넣고 id 를 반환합니다. 같은 팀/제목 작업이 이미 진행 중이면 그 id 를 반환합니다.
+
+        앞의 세 인자는 위치 전용이라 작업 함수에 ``title=`` 같은 같은 이름의 키워드 인자를 넘길 수 있습니다.
+        """
+        with self._cond:
+            for job_id, job in self._jobs.items():
+                if job["team"] == team_name and job["title"] == title:
+                    return job_id
+            job_id = uuid.uuid4().hex
+            job = {"id": job_id, "team": team_name, "title": title, "status": QUEUED, "created_at": time.time()}
+            self.store.insert(job)
+            self._jobs[job_id] = {**job, "fn": fn, "args": args, "kwargs": kwargs, "progress": {}}
+            self._queue.append(job_id)
+            self._cond.notify()
+        return job_id
+
+    def status(self, job_id):
+        """작업 상태 dict (진행 중이면 progress 와 대기 순서 position 포함). 없으면 None."""
+        if not job_id:
+            return None
+        with self._cond:
+            live = self._jobs.get(job_id)
+            if live is not None:
+                return {
+                    "id": job_id, "team": live["team"], "title": live["title"], "status": live["status"],
+                    "created_at": live["created_at"], "progress": dict(live["progress"]),
+                    "position": self._queue.index(job_id) if job_id in self._queue else 0,
+                }
+        return self.store.get(job_id)
+
+    def latest(self, team_name, title):
+        job = self.store.latest(team_name, title)
+        return self.status(job["id"]) if job else None
+
+    def _next(self):
+        # 팀별 동시 실행 한도를 넘지 않는 가장 오래된 작업
+        for job_id in self._queue:
+            team = self._jobs[job_id]["team"]
+            if self._running.get(team, 0) < self.team_limit:
+                self._queue.remove(job_id)
+                self._running[team] = self._running.get(team, 0) + 1
+                return self._jobs[job_id]
+        return None
+
+    def _work(self):
+        while True:
+            with self._cond:
+                job = self._next()
+                while job is None:
+                    self._cond.wait()
+                    job = self._next()
+                job["status"] = RUNNING
+            started = time.time()
+            self.store.update(job["id"], status=RUNNING, started_at=started)
+            try:
+                with team_context(job["team"]):
+                    result = job["fn"](job["progress"].update, *job["args"], **job["kwargs"])
+                self.store.update(job["id"], status=DONE, result=result, finished_at=time.time())
+            except Exception as e:
+                print(f"⚠️ 분석 작업 실패 ({job['team']} / {job['title']}): {e}")
+                self.store.update(job["id"], status=FAILED, error=f"{type(e).__name__}: {e}", finished_at=time.time())
+            finally:
+                with self._cond:
+                    self._running[job["team"]] -= 1
+                    self._jobs.pop(job["id"], None)
+                    self._cond.notify_all()
+
+
+_shared = None
+_shared_lock = threading.Lock()
+
+
+def shared_jobs():
+    global _shared
+    with _shared_lock:
+        if _shared is None:
+            _shared = JobQueue()
+        return _shared
@@ -0,0 +1,113 @@
+"""무거운 모듈 미리 불러오기(prewarm)와 모듈별 import 시간 측정.
+
+    python lazy_imports.py   # 모듈마다 새 프로세스에서 import 시간(콜드 스타트) 측정
+
+팀 코드 입력 화면은 streamlit과 가벼운 모듈만 불러오고, 나머지는 인증 이후에
+처음 필요한 곳(대시보드, PDF, 차트)에서 불러옵니다.
+"""
+import importlib
+import subprocess
+import sys
+import threading
+import time
+
+# ✅ 인증 이후에만 필요한 무거운 모듈 (prewarm 순서 = 필요한 순서)
+HEAVY_MODULES = [
+    "pandas",
+    "gspread",
+    "google.oauth2.service_account",
+    "googleapiclient.discovery",
+    "clients",
+    "drive_listing",
+    "openai",
+    "fingerprints",
+    "speaker_stats",
+    "history_cache",
+    "tiktoken",
+    "chunked_analysis",
+    "job_queue",
+    "analysis_jobs",
+    "token_index",
+    "altair",
+    "matplotlib.pyplot",
+    "wordcloud",
+    "gensim",
+    "topic_models",
+    "overview",
+    "fpdf",
+    "pdf_export",
+]
+
+# ✅ 첫 화면(팀 코드 입력)에서 불러오는 모듈
+STARTUP_MODULES = ["streamlit", "transcripts", "llm_cache", "feedback", "settings", "workers", "tracing"]
+
+# ✅ 첫 화면 import 시간 목표(초)
+COLD_START_BUDGET = 1.5
+
+_timings = {}
+_lock = threading.Lock()
+_prewarm_thread = None
+
+
+def timed_import(name):
+    """모듈을 불러오고, 이 프로세스에서 처음 불러온 경우 걸린 시간을 기록합니다."""
+    if name in sys.modules:
+        return sys.modules[name]
+    start = time.perf_counter()
+    module = importlib.import_module(name)
+    with _lock:
+        _timings.setdefault(name, time.perf_counter() - start)
+    return module
+
+
+def prewarm(names=HEAVY_MODULES):
+    """인증 직후 백그라운드 스레드에서 무거운 모듈을 미리 불러옵니다 (프로세스당 한 번)."""
+    global _prewarm_thread
+    with _lock:
+        if _prewarm_thread is not None:
+            return _prewarm_thread
+        _prewarm_thread = threading.Thread(target=_prewarm, args=(list(names),), daemon=True, name="prewarm")
+    _prewarm_thread.start()
+    return _prewarm_thread
+
+
+def _prewarm(names):
+    for name in names:
+        try:
+            timed_import(name)
+        except Exception as e:
+            print(f"⚠️ {name} 미리 불러오기 실패: {e}")
+
+
+def import_report():
+    # 이 프로세스에서 측정된 모듈별 import 시간 (느린 순)
+    with _lock:
+        return sorted(({"모듈": k, "시간(초)": round(v, 3)} for k, v in _timings.items()),
+                      key=lambda row: row["시간(초)"], reverse=True)
+
+
+def measure_cold(name):
+    # 새 인터프리터에서 해당 모듈만 불러오는 데 걸린 시간(초)
+    code = f"import time; t = time.perf_counter(); import {name}; print(time.perf_counter() - t)"
+    result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True)
+    if result.returncode != 0:
+        return None
+    return float(result.stdout.strip().splitlines()[-1])
+
+
+def main():
+    rows = [("첫 화면", name, measure_cold(name)) for name in STARTUP_MODULES]
+    rows += [("인증 이후", name, measure_cold(name)) for name in HEAVY_MODULES]
+    print(f"{'단계':<8} {'모듈':<32} {'콜드 import(초)':>15}")
+    for stage, name, seconds in rows:
+        print(f"{stage:<8} {name:<32} {'설치 안 됨' if seconds is None else f'{seconds:.3f}':>15}")
+    startup = measure_cold(", ".join(STARTUP_MODULES))
+    if startup is None:
+        print("\n첫 화면 모듈을 불러오지 못했습니다.")
+        sys.exit(1)
+    print(f"\n첫 화면 전체: {startup:.3f}초 (목표 {COLD_START_BUDGET}초)")
+    sys.exit(0 if startup <= COLD_START_BUDGET else 1)
+
+
+if __name__ == "__main__":
+    main()
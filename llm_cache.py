@@ -0,0 +1,126 @@
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+
+from rate_limit import estimate_tokens
+from settings import cache_path
+from tracing import record_usage, span
+
+DB_PATH = cache_path("llm.db")
+
+# ✅ 보관할 최대 응답 수 (넘으면 가장 오래 사용하지 않은 응답부터 삭제)
+MAX_ENTRIES = 2000
+
+
+def cache_key(model, messages, **params):
+    payload = json.dumps({"model": model, "messages": messages, "params": params},
+                         ensure_ascii=False, sort_keys=True)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class LLMCache:
+    """(모델, 프롬프트 전체) 해시를 키로 하는 OpenAI 응답 캐시 (SQLite, LRU 삭제)."""
+
+    def __init__(self, path=DB_PATH, max_entries=MAX_ENTRIES):
+        self.max_entries = max_entries
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS responses ("
+            "key TEXT PRIMARY KEY, model TEXT NOT NULL, content TEXT NOT NULL, "
+            "created_at REAL NOT NULL, used_at REAL NOT NULL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_responses_used ON responses(used_at)")
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock, self._conn:
+            row = self._conn.execute("SELECT content FROM responses WHERE key = ?", (key,)).fetchone()
+            if row:
+                self._conn.execute("UPDATE responses SET used_at = ? WHERE key = ?", (time.time(), key))
+        return row[0] if row else None
+
+    def put(self, key, model, content):
+        now = time.time()
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses (key, model, content, created_at, used_at) VALUES (?, ?, ?, ?, ?)",
+                (key, model, content, now, now),
+            )
+            self._conn.execute(
+                "DELETE FROM responses WHERE key IN ("
+                "SELECT key FROM responses ORDER BY used_at DESC LIMIT -1 OFFSET ?)",
+                (self.max_entries,),
+            )
+
+
+_shared = None
+_shared_lock = threading.Lock()
+
+
+def shared_cache():
+    global _shared
+    with _shared_lock:
+        if _shared is None:
+            _shared = LLMCache()
+        return _shared
+
+
+def _acquire(limiter, messages):
+    # 캐시에 없어 실제로 호출할 때만 분당 요청/토큰 한도를 차감
+    if limiter is not None:
+        limiter.acquire(sum(estimate_tokens(m["content"]) for m in messages))
+
+
+def cached_completion(client, model, messages, timeout=None, limiter=None, **params):
+    """같은 모델·프롬프트로 이미 받은 응답이 있으면 OpenAI를 호출하지 않고 반환합니다.
+
+    ``timeout`` 은 요청 제한 시간(초), ``limiter`` 는 호출 전에 기다릴 ``RateLimiter`` 이며
+    둘 다 캐시 키에는 포함되지 않습니다.
+    """
+    cache = shared_cache()
+    key = cache_key(model, messages, **params)
+    content = cache.get(key)
+    if content is not None:
+        record_usage(model, None, cached=True)
+        return content
+    _acquire(limiter, messages)
+    if timeout is not None:
+        params["timeout"] = timeout
+    with span("openai", model=model):
+        response = client.chat.completions.create(model=model, messages=messages, **params)
+    content = response.choices[0].message.content
+    record_usage(model, getattr(response, "usage", None))
+    cache.put(key, model, content)
+    return content
+
+
+def cached_stream(client, model, messages, timeout=None, limiter=None, **params):
+    """``cached_completion`` 의 스트리밍 버전. 응답 조각(문자열)을 차례로 내보냅니다.
+
+    캐시에 있으면 전체 응답을 한 번에 내보내고, 끝까지 받은 응답만 캐시에 저장합니다.
+    """
+    cache = shared_cache()
+    key = cache_key(model, messages, **params)
+    content = cache.get(key)
+    if content is not None:
+        record_usage(model, None, cached=True)
+        yield content
+        return
+    _acquire(limiter, messages)
+    if timeout is not None:
+        params["timeout"] = timeout
+    parts, usage = [], None
+    # 마지막 조각에 토큰 사용량(usage)을 포함하도록 요청
+    stream = client.chat.completions.create(model=model, messages=messages, stream=True,
+                                            stream_options={"include_usage": True}, **params)
+    for chunk in stream:
+        usage = getattr(chunk, "usage", None) or usage
+        delta = chunk.choices[0].delta.content if chunk.choices else None
+        if delta:
+            parts.append(delta)
+            yield delta
+    record_usage(model, usage)
+    cache.put(key, model, "".join(parts))
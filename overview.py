@@ -0,0 +1,129 @@
+import threading
+import time
+
+import pandas as pd
+
+from token_index import shared_index, term_frame
+
+# ✅ 관리자 개요를 백그라운드에서 다시 계산하는 주기(초)
+OVERVIEW_INTERVAL = 300
+
+# ✅ "최근 키워드"로 보는 팀별 최근 회의 수
+RECENT_MEETINGS = 3
+TOP_KEYWORDS = 5
+
+OVERVIEW_COLUMNS = [
+    "회의 수", "첫 회의", "최근 회의", "회의 간격(일)", "평균 분석 시간(초)",
+    "주요 키워드", "최근 늘어난 키워드", "최근 진행 요약",
+]
+
+
+def _top_words(row, n):
+    row = row[row > 0]
+    return ", ".join(row.sort_values(ascending=False, kind="stable").head(n).index)
+
+
+def compute_overview(df, teams=(), index=None, recent=RECENT_MEETINGS, top_n=TOP_KEYWORDS):
+    """전체 팀 결과 DataFrame 한 번의 groupby 로 팀별 집계표를 만듭니다 (행: 팀명).
+
+    teams 에 있는 팀은 기록이 없어도 0건으로 표시합니다.
+    """
+    if df.empty:
+        return _with_teams(pd.DataFrame(columns=OVERVIEW_COLUMNS), teams)
+
+    df = df.sort_values(["팀명", "시간"], kind="stable").reset_index(drop=True)
+    g = df.groupby("팀명", sort=False)
+    gaps = g["시간"].diff().dt.total_seconds() / 86400
+
+    overview = pd.DataFrame({
+        "회의 수": g.size(),
+        "첫 회의": g["시간"].min(),
+        "최근 회의": g["시간"].max(),
+        "회의 간격(일)": gaps.groupby(df["팀명"], sort=False).median().round(1),
+        "평균 분석 시간(초)": pd.to_numeric(df["분석 시간(초)"], errors="coerce").groupby(df["팀명"], sort=False).mean().round(1),
+        "최근 진행 요약": g["진행 요약"].last(),
+    })
+
+    # ✅ 키워드: 회차별 빈도(토큰 색인 재사용)를 팀 단위로 합산, 최근 회차 비중이 늘어난 단어도 함께 표시
+    terms = term_frame((index or shared_index()).counts(df["전체 회의록"].tolist()))
+    if not terms.empty:
+        is_recent = (g.cumcount(ascending=False) < recent).to_numpy()
+        total = terms.groupby(df["팀명"], sort=False).sum()
+        latest = terms[is_recent].groupby(df["팀명"][is_recent], sort=False).sum().reindex(total.index, fill_value=0)
+        earlier = total - latest
+        rising = latest.div(latest.sum(axis=1).replace(0, 1), axis=0) - earlier.div(earlier.sum(axis=1).replace(0, 1), axis=0)
+        rising = rising.where(earlier.sum(axis=1) > 0, 0)  # 이전 회차가 없으면 비교하지 않음
+        overview["주요 키워드"] = total.apply(_top_words, axis=1, n=top_n)
+        overview["최근 늘어난 키워드"] = rising.apply(_top_words, axis=1, n=top_n)
+
+    return _with_teams(overview.reindex(columns=OVERVIEW_COLUMNS), teams)
+
+
+def _with_teams(overview, teams):
+    missing = [t for t in teams if t not in overview.index]
+    if missing:
+        overview = pd.concat([overview, pd.DataFrame(index=missing, columns=OVERVIEW_COLUMNS)])
+    overview["회의 수"] = overview["회의 수"].fillna(0).astype(int)
+    overview.index.name = "팀명"
+    return overview
+
+
+class OverviewCache:
+    """관리자 개요 표를 주기적으로 백그라운드 스레드에서 다시 계산해 보관합니다."""
+
+    def __init__(self, history, teams, interval=OVERVIEW_INTERVAL):
+        self.history = history
+        self.teams = list(teams)
+        self.interval = interval
+        self.overview = None
+        self.computed_at = None
+        self.last_error = None
+        self._wake = threading.Event()
+        self._ready = threading.Event()
+        self._requested = 0  # refresh_now 호출 횟수 (이 값까지 반영한 계산이 끝나야 _ready)
+        self._lock = threading.Lock()
+        self._thread = threading.Thread(target=self._run, daemon=True, name="admin-overview")
+        self._thread.start()
+
+    def refresh_now(self):
+        # 다음 wait() 가 예전 표를 바로 돌려주지 않고 새로 계산한 표를 기다리도록 _ready 를 내림
+        with self._lock:
+            self._requested += 1
+            self._ready.clear()
+            self._wake.set()
+
+    def _run(self):
+        while True:
+            with self._lock:
+                requested = self._requested
+                self._wake.clear()
+            try:
+                self.overview = compute_overview(self.history.all_history(), self.teams)
+                self.computed_at = time.time()
+                self.last_error = None
+            except Exception as e:
+                self.last_error = e
+                print(f"⚠️ 관리자 개요 계산 실패: {e}")
+            with self._lock:
+                # 계산 도중 refresh_now 가 불렸으면 한 번 더 계산한 뒤에 알림
+                if self._requested == requested:
+                    self._ready.set()
+            self._wake.wait(self.interval)
+
+    def wait(self, timeout=None):
+        # 첫 계산(또는 refresh_now 이후의 새 계산)이 끝날 때까지 기다림 (이미 계산돼 있으면 바로 반환)
+        self._ready.wait(timeout)
+        return self.overview
+
+
+_caches = {}
+_caches_lock = threading.Lock()
+
+
+def shared_overview(history, teams):
+    # ✅ 프로세스 전체에서 시트당 하나의 개요 캐시(와 갱신 스레드)만 사용
+    with _caches_lock:
+        cache = _caches.get(id(history))
+        if cache is None:
+            cache = _caches[id(history)] = OverviewCache(history, teams)
+        return cache
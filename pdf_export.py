@@ -0,0 +1,98 @@
+import io
+import os
+import re
+import zipfile
+
+import fpdf.fpdf as _fpdf_module
+from fpdf import FPDF
+
+from feedback import SECTION_KEYS
+from settings import cache_path
+
+FONT_NAME = "malgun"
+FONT_PATH = "fonts/malgun.ttf"
+
+_EMOJI = re.compile(r'[\U00010000-\U0010ffff]')
+_UNSAFE_FILENAME = re.compile(r'[\\/:*?"<>|\s]+')
+
+# ✅ PyFPDF 1.x 는 TTF 파싱 결과(글꼴 정보)를 pickle 로 저장해 두고 다음 문서부터 재사용
+#    작업 폴더(fonts/) 대신 캐시 폴더에 저장
+if hasattr(_fpdf_module, "FPDF_CACHE_MODE"):
+    _fpdf_module.FPDF_CACHE_MODE = 2
+    _fpdf_module.FPDF_CACHE_DIR = os.path.dirname(cache_path("fonts", ""))
+
+
+class UnicodePDF(FPDF):
+    def __init__(self):
+        super().__init__()
+        self.add_font(FONT_NAME, "", FONT_PATH, uni=True)  # ✅ 폰트 경로는 직접 추가해야 함
+        self.set_font(FONT_NAME, size=12)
+
+    def add_text(self, text):
+        if self.page == 0:
+            self.add_page()
+        text = _EMOJI.sub('', text)  # 이모지 제거
+        for line in text.split('\n'):
+            self.multi_cell(0, 10, line)
+
+    def add_section(self, title, text):
+        # 회차마다 새 페이지 + 제목
+        self.add_page()
+        self.set_font(FONT_NAME, size=15)
+        self.multi_cell(0, 12, _EMOJI.sub('', title))
+        self.set_font(FONT_NAME, size=12)
+        self.add_text(text)
+
+    def to_bytes(self):
+        # 파일을 만들지 않고 메모리에서 PDF 바이트로 변환 (PyFPDF 1.x 는 latin-1 문자열을 반환)
+        data = self.output(dest="S")
+        return data.encode("latin-1") if isinstance(data, str) else bytes(data)
+
+
+def render_result(text):
+    """분석 결과 하나를 PDF 바이트로 만듭니다."""
+    pdf = UnicodePDF()
+    pdf.add_text(text)
+    return pdf.to_bytes()
+
+
+def _section(row):
+    title = f"[{row.get('팀명', '')}] {row.get('회의록 제목', '')} ({row.get('시간', '')})"
+    body = "\n\n".join(f"{key}:\n{row.get(key, '')}" for key in SECTION_KEYS)
+    return title, body
+
+
+def _rows(frames):
+    for frame in frames:
+        if frame is not None and not frame.empty:
+            yield from frame.to_dict("records")
+
+
+def export_pdf(frames):
+    # 모든 회차를 한 문서에 담아 글꼴은 한 번만 등록
+    pdf = UnicodePDF()
+    for row in _rows(frames):
+        pdf.add_section(*_section(row))
+    if pdf.page == 0:
+        pdf.add_text("저장된 분석 결과가 없습니다.")
+    return pdf.to_bytes()
+
+
+def export_zip(frames):
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w", zipfile.ZIP_DEFLATED) as zf:
+        for n, row in enumerate(_rows(frames), start=1):
+            title, body = _section(row)
+            pdf = UnicodePDF()
+            pdf.add_section(title, body)
+            name = _UNSAFE_FILENAME.sub("_", f"{n:03d}_{row.get('회의록 제목', '')}")
+            zf.writestr(f"{row.get('팀명', '')}/{name}.pdf", pdf.to_bytes())
+    return buffer.getvalue()
+
+
+def export_history(frames, fmt="pdf"):
+    """팀별 이력 DataFrame 목록을 하나의 PDF(fmt="pdf") 또는 회차별 PDF 묶음 ZIP(fmt="zip") 바이트로 만듭니다.
+
+    작업자 스레드에서 실행하므로 st.* 를 호출하지 않습니다.
+    """
+    return export_zip(frames) if fmt == "zip" else export_pdf(frames)
@@ -0,0 +1,65 @@
+import threading
+import time
+
+
+def estimate_tokens(text):
+    # 한국어는 대략 글자당 1토큰 이상 → 보수적으로 글자 수를 사용
+    return max(1, len(text or ""))
+
+
+class RateLimiter:
+    """분당 요청 수/토큰 수를 함께 제한하는 토큰 버킷 (스레드 안전)."""
+
+    def __init__(self, requests_per_minute, tokens_per_minute=None):
+        self.requests_per_minute = requests_per_minute
+        self.tokens_per_minute = tokens_per_minute
+        self._requests = float(requests_per_minute)
+        self._tokens = float(tokens_per_minute or 0)
+        self._updated = time.monotonic()
+        self._cond = threading.Condition()
+
+    def _refill(self):
+        now = time.monotonic()
+        elapsed = now - self._updated
+        self._updated = now
+        self._requests = min(self.requests_per_minute, self._requests + elapsed * self.requests_per_minute / 60)
+        if self.tokens_per_minute:
+            self._tokens = min(self.tokens_per_minute, self._tokens + elapsed * self.tokens_per_minute / 60)
+
+    def _wait_time(self, tokens):
+        need_requests = max(0.0, 1 - self._requests) * 60 / self.requests_per_minute
+        need_tokens = 0.0
+        if self.tokens_per_minute:
+            # 한 번에 버킷보다 큰 요청은 버킷이 가득 찼을 때 통과시킴
+            tokens = min(tokens, self.tokens_per_minute)
+            need_tokens = max(0.0, tokens - self._tokens) * 60 / self.tokens_per_minute
+        return max(need_requests, need_tokens)
+
+    def acquire(self, tokens=0):
+        """요청 1건과 ``tokens`` 만큼의 용량이 생길 때까지 기다립니다."""
+        with self._cond:
+            while True:
+                self._refill()
+                wait = self._wait_time(tokens)
+                if wait <= 0:
+                    self._requests -= 1
+                    if self.tokens_per_minute:
+                        self._tokens -= min(tokens, self.tokens_per_minute)
+                    return
+                self._cond.wait(wait)
+
+
+# ✅ 프로세스 전체에서 나눠 쓰는 OpenAI 호출 한도 (모든 세션/분석 작업 공통)
+OPENAI_REQUESTS_PER_MINUTE = 60
+OPENAI_TOKENS_PER_MINUTE = 300_000
+
+_shared = None
+_shared_lock = threading.Lock()
+
+
+def shared_limiter():
+    global _shared
+    with _shared_lock:
+        if _shared is None:
+            _shared = RateLimiter(OPENAI_REQUESTS_PER_MINUTE, OPENAI_TOKENS_PER_MINUTE)
+        return _shared
@@ -0,0 +1,210 @@
+import json
+import sqlite3
+import threading
+
+import pandas as pd
+
+from settings import RESULT_COLUMNS, cache_path
+from transcript_store import content_hash, shared_blobs, transcript_hash
+
+DB_PATH = cache_path("results.db")
+
+_COLUMN_DEFS = ", ".join(f"\"{col}\" TEXT NOT NULL DEFAULT ''" for col in RESULT_COLUMNS)
+
+_SCHEMA = f"""
+CREATE TABLE IF NOT EXISTS results (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    sheet_row INTEGER UNIQUE,
+    synced INTEGER NOT NULL DEFAULT 1,
+    content_hash TEXT NOT NULL DEFAULT '',
+    latency REAL,
+    {_COLUMN_DEFS}
+);
+CREATE INDEX IF NOT EXISTS idx_results_team_time ON results("팀명", "시간");
+CREATE INDEX IF NOT EXISTS idx_results_team_title ON results("팀명", "회의록 제목");
+CREATE INDEX IF NOT EXISTS idx_results_hash ON results(content_hash);
+CREATE INDEX IF NOT EXISTS idx_results_pending ON results(synced) WHERE synced = 0;
+CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT NOT NULL);
+"""
+
+_QUOTED = ", ".join(f'"{col}"' for col in RESULT_COLUMNS)
+
+_TRANSCRIPT = RESULT_COLUMNS.index("전체 회의록")
+
+
+def _normalize_times(values):
+    # 시트에 표시된 시간 문자열을 정렬 가능한 ISO 형식으로 통일
+    times = pd.to_datetime(pd.Series(values, dtype="object"), errors="coerce")
+    return times.dt.strftime("%Y-%m-%d %H:%M:%S").fillna("").tolist()
+
+
+class ResultsStore:
+    """구글시트 분석 결과를 팀/시간/제목/본문 해시로 색인한 로컬 SQLite 사본.
+
+    시트는 사람이 보는 내보내기 용도로 남기고, 조회와 중복 확인은 여기서 처리합니다.
+    아직 시트에 반영되지 않은 결과는 ``synced = 0`` 으로 남습니다.
+    "전체 회의록" 열에는 본문 대신 압축 저장소(BlobStore)의 참조만 보관하고,
+    본문이 필요할 때 ``transcript()`` 로 읽습니다.
+    """
+
+    def __init__(self, path=DB_PATH, blobs=None):
+        self.blobs = blobs or shared_blobs()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(_SCHEMA)
+        # 이전 버전 DB에는 분석 소요 시간(이 프로세스에서 저장한 결과만 기록) 열이 없음
+        columns = {row[1] for row in self._conn.execute("PRAGMA table_info(results)")}
+        if "latency" not in columns:
+            self._conn.execute("ALTER TABLE results ADD COLUMN latency REAL")
+        self._lock = threading.RLock()
+        self.version = 0
+
+    # ✅ 메타 정보 (시트 헤더, 가져온 행 수)
+    def _get_meta(self, key, default):
+        row = self._conn.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return json.loads(row[0]) if row else default
+
+    def _set_meta(self, key, value):
+        self._conn.execute(
+            "INSERT INTO meta (key, value) VALUES (?, ?) ON CONFLICT(key) DO UPDATE SET value = excluded.value",
+            (key, json.dumps(value, ensure_ascii=False)),
+        )
+
+    @property
+    def header(self):
+        with self._lock:
+            return self._get_meta("header", [])
+
+    @property
+    def imported_rows(self):
+        with self._lock:
+            return self._get_meta("imported_rows", 0)
+
+    def reset_mirror(self):
+        # 시트에서 가져온 행만 지우고, 아직 전송하지 못한 결과는 유지
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM results WHERE synced = 1")
+            self._conn.execute("UPDATE results SET sheet_row = NULL")
+            self._conn.execute("DELETE FROM meta")
+            self.version += 1
+
+    def import_sheet_rows(self, header, rows):
+        """시트의 새 행(헤더 다음부터 순서대로)을 사본에 반영합니다."""
+        header = [str(col).strip() for col in header]
+        with self._lock, self._conn:
+            first_row = self._get_meta("imported_rows", 0) + 2
+            positions = {col: header.index(col) for col in RESULT_COLUMNS if col in header}
+            records = [
+                {col: (row[i] if i < len(row) else "") for col, i in positions.items()}
+                for row in rows
+            ]
+            times = _normalize_times([r.get("시간", "") for r in records])
+            for offset, (record, time_value) in enumerate(zip(records, times)):
+                record["시간"] = time_value
+                values = [str(record.get(col, "")) for col in RESULT_COLUMNS]
+                # 본문이 그대로 저장된 예전 행도 압축 저장소로 옮기고 참조만 보관
+                values[_TRANSCRIPT] = self.blobs.store(values[_TRANSCRIPT])
+                digest = transcript_hash(values[_TRANSCRIPT])
+                sheet_row = first_row + offset
+                # 이 프로세스가 저장해 둔 결과가 시트에 반영된 경우 → 새로 넣지 않고 연결
+                pending = self._conn.execute(
+                    'SELECT id FROM results WHERE sheet_row IS NULL AND "팀명" = ? AND "회의록 제목" = ? '
+                    'AND "시간" = ? AND content_hash = ? LIMIT 1',
+                    (record.get("팀명", ""), record.get("회의록 제목", ""), time_value, digest),
+                ).fetchone()
+                if pending:
+                    self._conn.execute(
+                        "UPDATE results SET sheet_row = ?, synced = 1 WHERE id = ?", (sheet_row, pending[0])
+                    )
+                else:
+                    self._conn.execute(
+                        f"INSERT OR IGNORE INTO results (sheet_row, synced, content_hash, {_QUOTED}) "
+                        f"VALUES (?, 1, ?, {', '.join('?' * len(RESULT_COLUMNS))})",
+                        [sheet_row, digest, *values],
+                    )
+            self._set_meta("header", header)
+            self._set_meta("imported_rows", first_row - 2 + len(rows))
+            if rows:
+                self.version += 1
+
+    # ✅ 새 분석 결과 (시트 전송 대기)
+    def add_result(self, values, latency=None):
+        values = [str(v) for v in values]
+        # 시트에는 본문 대신 참조(해시 + 글자 수)가 전송됨
+        values[_TRANSCRIPT] = self.blobs.store(values[_TRANSCRIPT])
+        with self._lock, self._conn:
+            cur = self._conn.execute(
+                f"INSERT INTO results (sheet_row, synced, content_hash, latency, {_QUOTED}) "
+                f"VALUES (NULL, 0, ?, ?, {', '.join('?' * len(RESULT_COLUMNS))})",
+                [transcript_hash(values[_TRANSCRIPT]), latency, *values],
+            )
+            self.version += 1
+            return cur.lastrowid
+
+    def pending(self, limit=None):
+        sql = f"SELECT id, {_QUOTED} FROM results WHERE synced = 0 ORDER BY id"
+        if limit:
+            sql += f" LIMIT {int(limit)}"
+        with self._lock:
+            return [(row[0], list(row[1:])) for row in self._conn.execute(sql)]
+
+    def pending_count(self):
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM results WHERE synced = 0").fetchone()[0]
+
+    def mark_synced(self, result_ids):
+        # 시트 행 번호는 가져오기 커서(import_sheet_rows)가 나중에 연결함
+        with self._lock, self._conn:
+            self._conn.executemany("UPDATE results SET synced = 1 WHERE id = ?", [(i,) for i in result_ids])
+
+    # ✅ 조회
+    def team_frame(self, team_name):
+        with self._lock:
+            df = pd.read_sql_query(
+                f"SELECT {_QUOTED} FROM results WHERE \"팀명\" = ? ORDER BY \"시간\" = '', \"시간\", id",
+                self._conn,
+                params=(team_name,),
+            )
+        if df.empty:
+            return pd.DataFrame()
+        df["시간"] = pd.to_datetime(df["시간"], errors="coerce")
+        return df
+
+    def all_frame(self):
+        # 전체 팀 결과 + 분석 소요 시간 (관리자 개요용)
+        with self._lock:
+            df = pd.read_sql_query(
+                f"SELECT {_QUOTED}, latency AS \"분석 시간(초)\" FROM results ORDER BY \"시간\" = '', \"시간\", id",
+                self._conn,
+            )
+        df["시간"] = pd.to_datetime(df["시간"], errors="coerce")
+        return df
+
+    def transcripts_after(self, row_id):
+        # 지정한 id 이후 행의 (id, 본문 해시, 팀명, 제목, 전체 회의록 참조)
+        with self._lock:
+            return self._conn.execute(
+                'SELECT id, content_hash, "팀명", "회의록 제목", "전체 회의록" FROM results WHERE id > ? ORDER BY id',
+                (row_id,),
+            ).fetchall()
+
+    def sections_after(self, row_id, columns):
+        # 지정한 id 이후 행의 (id, 팀명, 시간, 제목, 본문 해시, *columns)
+        quoted = ", ".join(f'"{col}"' for col in columns)
+        with self._lock:
+            return self._conn.execute(
+                f'SELECT id, "팀명", "시간", "회의록 제목", content_hash, {quoted} FROM results WHERE id > ? ORDER BY id',
+                (row_id,),
+            ).fetchall()
+
+    def transcript(self, value):
+        # "전체 회의록" 값(참조 또는 예전 행의 본문) → 본문
+        return self.blobs.load(value)
+
+    def find_duplicate(self, team_name, title, text):
+        with self._lock:
+            row = self._conn.execute(
+                'SELECT id FROM results WHERE "팀명" = ? AND "회의록 제목" = ? AND content_hash = ? LIMIT 1',
+                (team_name, title, content_hash(text)),
+            ).fetchone()
+        return row is not None
@@ -0,0 +1,31 @@
+import os
+
+# ✅ 분석 결과가 저장되는 구글시트
+SHEET_KEY = "1LNKXL83dNvsHDOHEkw7avxKRsYWCiIIIYKUPiF1PZGY"
+
+# ✅ 로컬 캐시/인덱스 파일을 보관하는 폴더
+CACHE_DIR = os.environ.get("GYOGONG_CACHE_DIR", ".cache")
+
+# ✅ 팀별 회의록 구글 드라이브 폴더
+folder_ids = {
+    "팀test": "1-9vL1B5O2LoS1uyBzPK3Y6kIfOSKG-Fo",
+    "AESPA팀": "1xdm-vXZ-bjch2bQWgHZ_GuQ8VjguCCaD",
+    "쎔플팀": "1BFqy-38ZOFEvxvqPBwRo5-SOaVSoK-oL",
+    "삼삼오오팀": "1Ey9nh0vICcDOtQrIQg0XbLEehqNIShYb",
+    "피원에듀포팀": "1kAb13Qipe-0xw2o6WbLXLi2xrcqjuxoc",
+    "상명서당팀": "1dkSXOSTMDewbt0oGj-FZvWHPCFpTe8vK",
+    "NCT팀": "17C8Yfjvr8d3kR1XLJtjfcx80xBjaON1p"
+}
+
+# ✅ 시트에 저장되는 열 순서 ("전체 회의록" 에는 본문 대신 transcript_store 참조가 저장됨)
+RESULT_COLUMNS = [
+    "시간", "팀명", "회의록 제목",
+    "역할 정리", "자기조절", "메타인지", "정서적 피드백", "개선 제안", "진행 요약", "다음 회의 제안",
+    "전체 회의록",
+]
+
+
+def cache_path(*parts):
+    path = os.path.join(CACHE_DIR, *parts)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    return path
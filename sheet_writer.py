@@ -0,0 +1,107 @@
+import atexit
+import random
+import threading
+
+from gspread.exceptions import APIError
+
+# ✅ 한 번의 append_rows 요청에 담는 최대 행 수
+BATCH_SIZE = 50
+
+# ✅ 저장 요청 후 같은 배치로 묶기 위해 기다리는 시간(초)
+LINGER = 1.0
+
+# ✅ 대기열을 주기적으로 확인하는 간격(초) - 재시작 후 남은 행도 이 주기로 전송
+POLL_INTERVAL = 30
+
+# ✅ 재시도 대기 시간(초): BACKOFF_BASE * 2^n, 최대 BACKOFF_MAX
+BACKOFF_BASE = 2.0
+BACKOFF_MAX = 300.0
+
+
+def _is_quota_error(e):
+    status = getattr(getattr(e, "response", None), "status_code", None)
+    return status == 429 or (status is not None and status >= 500)
+
+
+class SheetWriter(threading.Thread):
+    """로컬 저장소(ResultsStore)의 미전송 행을 모아 시트에 일괄 추가하는 write-behind 작업자.
+
+    미전송 행은 SQLite 저장소에 ``synced = 0`` 으로 남아 있으므로 프로세스가
+    재시작되어도 사라지지 않고, 다음 주기에 다시 전송됩니다.
+    """
+
+    def __init__(self, cache, batch_size=BATCH_SIZE, linger=LINGER, poll_interval=POLL_INTERVAL):
+        super().__init__(daemon=True, name="sheet-writer")
+        self.cache = cache
+        self.batch_size = batch_size
+        self.linger = linger
+        self.poll_interval = poll_interval
+        self.failures = 0
+        self.last_error = None
+        self._flush_lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._stopping = threading.Event()
+
+    def notify(self):
+        self._wakeup.set()
+
+    def stop(self):
+        self._stopping.set()
+        self._wakeup.set()
+
+    def backoff(self):
+        if not self.failures:
+            return 0.0
+        delay = min(BACKOFF_MAX, BACKOFF_BASE * 2 ** (self.failures - 1))
+        return delay * random.uniform(0.5, 1.0)
+
+    def flush(self):
+        """대기 중인 행을 배치 단위로 모두 전송합니다. 실패하면 False를 반환합니다."""
+        with self._flush_lock:
+            return self._flush()
+
+    def _flush(self):
+        while True:
+            batch = self.cache.store.pending(limit=self.batch_size)
+            if not batch:
+                return True
+            try:
+                self.cache.worksheet.append_rows([values for _, values in batch])
+            except APIError as e:
+                self.failures += 1
+                self.last_error = e
+                kind = "할당량 초과" if _is_quota_error(e) else "API 오류"
+                print(f"⚠️ 시트 저장 {kind}, {self.backoff():.0f}초 후 재시도: {e}")
+                return False
+            except Exception as e:
+                self.failures += 1
+                self.last_error = e
+                print(f"⚠️ 시트 저장 실패, 재시도 예정: {e}")
+                return False
+            self.failures = 0
+            self.last_error = None
+            self.cache.store.mark_synced([result_id for result_id, _ in batch])
+            self.cache.invalidate()
+
+    def run(self):
+        while not self._stopping.is_set():
+            if self.failures:
+                self._stopping.wait(self.backoff())
+            else:
+                self._wakeup.wait(self.poll_interval)
+                self._wakeup.clear()
+                # 동시에 끝난 다른 팀의 결과도 같은 요청으로 묶음
+                self._stopping.wait(self.linger)
+            self.flush()
+
+    def pending_count(self):
+        return self.cache.store.pending_count()
+
+
+def start_writer(cache):
+    writer = SheetWriter(cache)
+    writer.start()
+    # 종료 시 남은 행을 한 번 더 전송 시도 (실패해도 저장소에 남아 다음 실행 때 전송)
+    atexit.register(writer.flush)
+    writer.notify()
+    return writer
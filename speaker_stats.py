@@ -0,0 +1,191 @@
+import json
+import re
+import sqlite3
+import threading
+
+import pandas as pd
+
+from settings import cache_path
+from transcript_store import shared_blobs, transcript_hash
+
+DB_PATH = cache_path("speakers.db")
+
+# ✅ 발화 줄 해석 규칙이 바뀌면 올림 (저장해 둔 예전 통계를 쓰지 않고 다시 계산)
+PARSER_VERSION = 2
+
+# ✅ "이름: 내용" 형식의 발화 줄 (앞에 [00:01:23] 같은 시각이 붙어도 됨, "https://..." 같은 주소는 제외)
+_TURN = re.compile(
+    r"^\s*(?:\[?(?P<time>\d{1,2}:\d{2}(?::\d{2})?)\]?\s*)?"
+    r"(?P<speaker>[가-힣A-Za-z][가-힣A-Za-z0-9._]{0,14})\s*[:：](?!//)\s*(?P<content>.*)$"
+)
+
+# ✅ 화자로 보지 않는 회의록 머리말 항목
+NOT_SPEAKERS = frozenset([
+    "안건", "일시", "장소", "참석자", "참석", "주제", "결론", "회의", "시간", "날짜", "목표", "내용", "비고", "결정", "할일",
+    "참고", "출처", "링크", "자료", "메모", "질문", "답변", "요약", "Q", "A", "Note", "TODO", "URL",
+])
+
+STAT_COLUMNS = ["화자", "발화 수", "글자 수", "단어 수", "발화 비율", "글자 비율", "단어 비율", "응답 수", "평균 응답 간격(초)"]
+
+
+def _seconds(times):
+    # "mm:ss" / "hh:mm:ss" → 초 (시각이 없으면 NaN)
+    parts = times.str.extract(r"^(\d+):(\d+)(?::(\d+))?$").astype(float)
+    return (parts[0] * 3600 + parts[1] * 60 + parts[2]).where(parts[2].notna(), parts[0] * 60 + parts[1])
+
+
+def parse_turns(text):
+    """회의록 본문 → 발화 차례 DataFrame [화자, 글자 수, 단어 수, 시작(초)].
+
+    화자 표시가 없는 줄은 앞 발화에 이어 붙이고, 같은 화자가 연달아 말한 줄은 한 차례로 합칩니다.
+    """
+    lines = pd.Series((text or "").splitlines(), dtype="object")
+    lines = lines[lines.str.strip() != ""]
+    if lines.empty:
+        return pd.DataFrame(columns=["화자", "글자 수", "단어 수", "시작(초)"])
+    parts = lines.str.extract(_TURN)
+    parts.loc[parts["speaker"].isin(NOT_SPEAKERS), ["time", "speaker"]] = None
+    content = parts["content"].where(parts["speaker"].notna(), lines)
+    speaker = parts["speaker"].ffill()
+    keep = speaker.notna()  # 첫 화자 이전 머리말은 제외
+    speaker, content, times = speaker[keep], content[keep].str.strip(), parts["time"][keep]
+    turn = (speaker != speaker.shift()).cumsum()
+    frame = pd.DataFrame({
+        "turn": turn,
+        "화자": speaker,
+        "글자 수": content.str.replace(r"\s", "", regex=True).str.len(),
+        "단어 수": content.str.split().str.len(),
+        "시작(초)": _seconds(times.fillna("")),
+    })
+    g = frame.groupby("turn", sort=True)
+    return pd.DataFrame({
+        "화자": g["화자"].first(),
+        "글자 수": g["글자 수"].sum(),
+        "단어 수": g["단어 수"].sum(),
+        "시작(초)": g["시작(초)"].first(),
+    }).reset_index(drop=True)
+
+
+def speaker_summary(text):
+    """회의록 한 건의 화자별 발화 통계 (JSON 으로 저장 가능한 dict).
+
+    ``speakers``: STAT_COLUMNS 순서의 화자별 기록 (글자 비율 높은 순), ``turns``: 발화 차례 수,
+    ``transitions``: {앞 화자: {다음 화자: 횟수}}. 응답 간격은 발화 시각이 적힌 회의록에서만 계산합니다.
+    """
+    turns = parse_turns(text)
+    if turns.empty:
+        return {"speakers": [], "turns": 0, "transitions": {}}
+    previous = turns["화자"].shift()
+    responded = previous.notna()  # 같은 화자의 연속 줄은 이미 합쳐졌으므로 앞 차례는 다른 화자
+    gap = turns["시작(초)"].diff().where(responded & (turns["시작(초)"].diff() >= 0))
+
+    g = turns.groupby("화자", sort=False)
+    stats = pd.DataFrame({
+        "발화 수": g.size(),
+        "글자 수": g["글자 수"].sum(),
+        "단어 수": g["단어 수"].sum(),
+        "응답 수": responded.groupby(turns["화자"], sort=False).sum(),
+        "평균 응답 간격(초)": gap.groupby(turns["화자"], sort=False).mean().round(1),
+    })
+    for col, share in (("발화 수", "발화 비율"), ("글자 수", "글자 비율"), ("단어 수", "단어 비율")):
+        stats[share] = (stats[col] / max(stats[col].sum(), 1)).round(4)
+    stats = stats.sort_values("글자 비율", ascending=False, kind="stable").rename_axis("화자").reset_index()
+
+    transitions = pd.crosstab(previous[responded], turns["화자"][responded])
+    stats = stats[STAT_COLUMNS].astype(object).where(stats[STAT_COLUMNS].notna(), None)
+    return {
+        "speakers": stats.to_dict("records"),
+        "turns": int(len(turns)),
+        "transitions": {a: {b: int(n) for b, n in row.items() if n} for a, row in transitions.iterrows()},
+    }
+
+
+def speakers_frame(summary):
+    return pd.DataFrame(summary["speakers"], columns=STAT_COLUMNS)
+
+
+def grounding_text(summary, limit=10):
+    """LLM 프롬프트에 붙이는 발화 통계 요약 (화자가 없으면 빈 문자열)."""
+    if not summary["speakers"]:
+        return ""
+    lines = [f"[발화 통계] 전체 발화 차례 {summary['turns']}회"]
+    for s in summary["speakers"][:limit]:
+        line = f"- {s['화자']}: 발화 {s['발화 수']}회({s['발화 비율']:.0%}), 글자 비중 {s['글자 비율']:.0%}"
+        if s["평균 응답 간격(초)"] is not None:
+            line += f", 평균 응답 간격 {s['평균 응답 간격(초)']}초"
+        lines.append(line)
+    return "\n".join(lines)
+
+
+class SpeakerIndex:
+    """회의록 본문 해시 → 화자별 발화 통계를 보관하는 색인 (메모리 + SQLite)."""
+
+    def __init__(self, path=DB_PATH):
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._table = f"speakers_v{PARSER_VERSION}"
+        self._conn.execute(f"CREATE TABLE IF NOT EXISTS {self._table} (hash TEXT PRIMARY KEY, summary TEXT NOT NULL)")
+        self._lock = threading.Lock()
+        self._memory = {}
+
+    def _load(self, digests):
+        missing = [d for d in set(digests) if d not in self._memory]
+        for i in range(0, len(missing), 500):
+            batch = missing[i:i + 500]
+            rows = self._conn.execute(
+                f"SELECT hash, summary FROM {self._table} WHERE hash IN ({', '.join('?' * len(batch))})", batch
+            )
+            for digest, summary in rows:
+                self._memory[digest] = json.loads(summary)
+
+    def summaries(self, texts):
+        """본문(또는 "전체 회의록" 참조) 목록에 대한 발화 통계 목록. 처음 보는 본문만 새로 계산합니다."""
+        texts = [text or "" for text in texts]
+        digests = [transcript_hash(text) for text in texts]
+        with self._lock:
+            self._load(digests)
+            new_rows = []
+            for digest, text in zip(digests, texts):
+                if digest not in self._memory:
+                    summary = self._memory[digest] = speaker_summary(shared_blobs().load(text))
+                    new_rows.append((digest, json.dumps(summary, ensure_ascii=False)))
+            if new_rows:
+                with self._conn:
+                    self._conn.executemany(
+                        f"INSERT OR REPLACE INTO {self._table} (hash, summary) VALUES (?, ?)", new_rows
+                    )
+            return [self._memory[d] for d in digests]
+
+
+def history_frame(df, index=None):
+    """팀 이력 DataFrame → 회차별 화자 통계 [시간, 회의록 제목, 회차, *STAT_COLUMNS] (추이 차트용)."""
+    if df.empty or "전체 회의록" not in df.columns:
+        return pd.DataFrame(columns=["시간", "회의록 제목", "회차", *STAT_COLUMNS])
+    summaries = (index or shared_speakers()).summaries(df["전체 회의록"].fillna("").tolist())
+    frames = [
+        speakers_frame(summary).assign(시간=row_time, **{"회의록 제목": title, "회차": f"{n + 1}회차"})
+        for n, (summary, row_time, title) in enumerate(zip(summaries, df["시간"], df["회의록 제목"]))
+        if summary["speakers"]
+    ]
+    if not frames:
+        return pd.DataFrame(columns=["시간", "회의록 제목", "회차", *STAT_COLUMNS])
+    return pd.concat(frames, ignore_index=True)[["시간", "회의록 제목", "회차", *STAT_COLUMNS]]
+
+
+def total_share(history):
+    # 전체 이력의 화자별 글자 수 합계 비율 (파이 차트용)
+    if history.empty:
+        return pd.Series(dtype=float)
+    totals = history.groupby("화자")["글자 수"].sum().sort_values(ascending=False)
+    return totals / totals.sum()
+
+
+_shared = None
+_shared_lock = threading.Lock()
+
+
+def shared_speakers():
+    global _shared
+    with _shared_lock:
+        if _shared is None:
+            _shared = SpeakerIndex()
+        return _shared
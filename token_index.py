@@ -0,0 +1,101 @@
+import json
+import re
+import sqlite3
+import threading
+from collections import Counter
+
+import pandas as pd
+
+from settings import cache_path
+from transcript_store import shared_blobs, transcript_hash
+
+DB_PATH = cache_path("tokens.db")
+
+# ✅ 한글/공백 이외 문자 제거 (한 번만 컴파일)
+_NON_KOREAN = re.compile(r"[^가-힣\s]")
+
+STOPWORDS = frozenset([
+    "그리고", "그러나", "때문에", "등",
+    "위한", "하는", "있다", "있습니다", "이다", "된다", "같다",
+    "경우", "정도", "부분", "내용", "방법", "활동", "결과", "제시",
+    "대한", "대해", "이에", "로서",
+    "으로", "것이", "로부터", "에게", "된다면", "합니다", "있어요"
+])
+
+
+def clean_korean_text(text):
+    words = _NON_KOREAN.sub("", text or "").split()
+    return [w for w in words if len(w) > 1 and w not in STOPWORDS and len(w) <= 6]
+
+
+class TokenIndex:
+    """회의록 본문 해시 → 토큰 목록/빈도를 보관하는 색인 (메모리 + SQLite)."""
+
+    def __init__(self, path=DB_PATH):
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS tokens (hash TEXT PRIMARY KEY, tokens TEXT NOT NULL, counts TEXT NOT NULL)"
+        )
+        self._lock = threading.Lock()
+        self._memory = {}
+
+    def _load(self, digests):
+        missing = [d for d in digests if d not in self._memory]
+        for i in range(0, len(missing), 500):
+            batch = missing[i:i + 500]
+            rows = self._conn.execute(
+                f"SELECT hash, tokens, counts FROM tokens WHERE hash IN ({', '.join('?' * len(batch))})", batch
+            )
+            for digest, tokens, counts in rows:
+                self._memory[digest] = (json.loads(tokens), Counter(json.loads(counts)))
+
+    def entries(self, texts):
+        """본문(또는 "전체 회의록" 참조) 목록에 대한 (토큰 목록, 빈도) 목록.
+
+        처음 보는 본문만 새로 토큰화하며, 참조는 이때만 압축 저장소에서 본문을 읽습니다.
+        """
+        texts = [text or "" for text in texts]
+        digests = [transcript_hash(text) for text in texts]
+        with self._lock:
+            self._load(digests)
+            new_rows = []
+            for digest, text in zip(digests, texts):
+                if digest not in self._memory:
+                    tokens = clean_korean_text(shared_blobs().load(text))
+                    counts = Counter(tokens)
+                    self._memory[digest] = (tokens, counts)
+                    new_rows.append((digest, json.dumps(tokens, ensure_ascii=False), json.dumps(counts, ensure_ascii=False)))
+            if new_rows:
+                with self._conn:
+                    self._conn.executemany("INSERT OR REPLACE INTO tokens (hash, tokens, counts) VALUES (?, ?, ?)", new_rows)
+            return [self._memory[d] for d in digests]
+
+    def tokens(self, texts):
+        return [tokens for tokens, _ in self.entries(texts)]
+
+    def counts(self, texts):
+        return [counts for _, counts in self.entries(texts)]
+
+
+def term_frame(counts):
+    """회차별 빈도 목록 → (회차 × 단어) 빈도 DataFrame. 열 순서는 처음 등장한 순서."""
+    return pd.DataFrame([dict(c) for c in counts], index=range(len(counts))).fillna(0).astype(int)
+
+
+def top_terms(frame, n):
+    # 전체 빈도 상위 n개 (동률이면 먼저 등장한 단어 우선 → Counter.most_common과 같은 순서)
+    if frame.empty:
+        return []
+    return frame.sum().sort_values(ascending=False, kind="stable").head(n).index.tolist()
+
+
+_shared = None
+_shared_lock = threading.Lock()
+
+
+def shared_index():
+    global _shared
+    with _shared_lock:
+        if _shared is None:
+            _shared = TokenIndex()
+        return _shared
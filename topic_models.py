@@ -0,0 +1,112 @@
+import copy
+import threading
+from collections import OrderedDict
+
+from gensim import corpora
+from gensim.models.ldamodel import LdaModel
+
+# ✅ 메모리에 보관할 최대 LDA 모델 수
+MAX_MODELS = 32
+
+# ✅ 이전에 학습한 모델(선택 회차의 일부로 학습)이 있으면 새 회차만 추가 학습
+# (새 회차에 처음 나온 단어가 있으면 처음부터 다시 학습. 결과가 회차를 고른 순서에 따라 달라지므로 기본은 끔)
+UPDATE_MODELS = False
+
+
+class TeamCorpus:
+    """팀 단위로 공유하는 gensim Dictionary와 회차(본문 해시)별 BoW.
+
+    새 회차가 들어올 때만 Dictionary에 단어를 추가하므로 기존 단어 ID는 바뀌지 않습니다.
+    """
+
+    def __init__(self):
+        self.dictionary = corpora.Dictionary()
+        self._bows = {}
+
+    def add(self, digests, token_lists):
+        new = [(d, tokens) for d, tokens in zip(digests, token_lists) if d not in self._bows]
+        if new:
+            self.dictionary.add_documents([tokens for _, tokens in new])
+            for d, tokens in new:
+                self._bows[d] = self.dictionary.doc2bow(tokens)
+
+    def corpus(self, digests):
+        return [self._bows[d] for d in digests]
+
+
+class TopicModelCache:
+    """(팀, 선택 회차 해시, 토픽 수, 추가 학습 여부) → 학습된 LDA 모델과 토픽 요약을 보관합니다.
+
+    추가 학습한 모델은 처음부터 학습한 모델과 다른 키로 보관하므로, 같은 선택이라도
+    추가 학습을 쓰지 않는 요청에는 처음부터 학습한 모델만 돌려줍니다.
+    """
+
+    def __init__(self, max_models=MAX_MODELS):
+        self.max_models = max_models
+        self._teams = {}
+        self._models = OrderedDict()
+        self.summaries = {}
+        self._lock = threading.RLock()
+
+    def team(self, team_name):
+        with self._lock:
+            corpus = self._teams.get(team_name)
+            if corpus is None:
+                corpus = self._teams[team_name] = TeamCorpus()
+            return corpus
+
+    def _closest_subset(self, team_name, digests, num_topics):
+        # 선택한 회차의 일부로 학습된 모델 중 가장 많이 겹치는 것
+        best = None
+        for (team, key_digests, topics, _), model in self._models.items():
+            if team == team_name and topics == num_topics and key_digests < digests:
+                if best is None or len(key_digests) > len(best[0]):
+                    best = (key_digests, model)
+        return best
+
+    def get_model(self, team_name, digests, token_lists, num_topics=3, update=UPDATE_MODELS):
+        """모델 키와 LDA 모델을 반환합니다. 빈 코퍼스면 모델은 None 입니다."""
+        key_digests = frozenset(digests)
+        fresh_key = (team_name, key_digests, num_topics, False)
+        with self._lock:
+            for key in (fresh_key, (*fresh_key[:3], True)) if update else (fresh_key,):
+                model = self._models.get(key)
+                if model is not None:
+                    self._models.move_to_end(key)
+                    return key, model
+            key = fresh_key
+
+            team = self.team(team_name)
+            team.add(digests, token_lists)
+            if len(team.dictionary) == 0 or not any(team.corpus(digests)):
+                return key, None
+
+            base = self._closest_subset(team_name, key_digests, num_topics) if update else None
+            new_corpus = None
+            if base is not None:
+                base_digests, base_model = base
+                new_corpus = team.corpus([d for d in digests if d not in base_digests])
+                # 학습 당시 어휘에 없던 단어가 나오면 그 단어를 버리지 않도록 처음부터 다시 학습
+                if any(i >= base_model.num_terms for bow in new_corpus for i, _ in bow):
+                    new_corpus = None
+            if new_corpus is not None:
+                # 기존 모델을 복사해 새 회차만 추가 학습
+                model = copy.deepcopy(base_model)
+                model.update(new_corpus)
+                key = (*fresh_key[:3], True)
+            else:
+                model = LdaModel(corpus=team.corpus(digests), id2word=team.dictionary,
+                                 num_topics=num_topics, random_state=42)
+
+            self._models[key] = model
+            while len(self._models) > self.max_models:
+                old_key, _ = self._models.popitem(last=False)
+                self.summaries.pop(old_key, None)
+            return key, model
+
+
+_shared = TopicModelCache()
+
+
+def shared_topics():
+    return _shared
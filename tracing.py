@@ -0,0 +1,199 @@
+"""단계별 소요 시간(span)과 OpenAI 토큰 사용량/예상 비용 기록.
+
+    python tracing.py   # 로컬 지표 파일(.cache/metrics.jsonl)에서 단계별 p50/p95, 팀별 비용 출력
+
+기록은 한 줄에 하나씩 JSON 으로 추가되므로 다른 도구에서 그대로 읽을 수 있습니다.
+"""
+import collections
+import contextvars
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+from settings import cache_path
+
+METRICS_PATH = cache_path("metrics.jsonl")
+
+# ✅ 메모리에 보관하는 최근 기록 수 (관리자 패널 통계용)
+MAX_RECORDS = 5000
+
+# ✅ 이보다 빨리 끝난 span 은 캐시 적중으로 보고 기록하지 않을 때 쓰는 기준(초) (span(..., min_seconds=...))
+CACHE_HIT_SECONDS = 0.01
+
+# ✅ 지표 파일이 MAX_RECORDS 의 몇 배를 넘으면 최근 MAX_RECORDS 건만 남기고 다시 쓰는지
+COMPACT_FACTOR = 2
+
+# ✅ 모델별 1K 토큰당 예상 비용 (USD, 입력/출력)
+PRICES = {
+    "gpt-4-turbo": (0.01, 0.03),
+    "gpt-4": (0.03, 0.06),
+    "gpt-3.5-turbo": (0.0005, 0.0015),
+}
+
+_team = contextvars.ContextVar("trace_team", default=None)
+
+
+def estimate_cost(model, prompt_tokens, completion_tokens):
+    prompt_price, completion_price = PRICES.get(model, (0.0, 0.0))
+    return (prompt_tokens * prompt_price + completion_tokens * completion_price) / 1000
+
+
+class MetricsLog:
+    """지표 기록을 파일에 추가하고, 최근 기록은 메모리에도 보관합니다.
+
+    파일 줄 수가 ``max_records * COMPACT_FACTOR`` 를 넘으면 최근 ``max_records`` 건만 남기고
+    다시 쓰므로 파일 크기와 시작 시 읽는 양이 일정하게 유지됩니다.
+    """
+
+    def __init__(self, path=METRICS_PATH, max_records=MAX_RECORDS):
+        self.path = path
+        self.max_lines = max_records * COMPACT_FACTOR
+        self._lock = threading.Lock()
+        self.records = collections.deque(maxlen=max_records)
+        self._lines = 0
+        if os.path.exists(path):
+            lines = collections.deque(maxlen=max_records)
+            with open(path, encoding="utf-8") as f:
+                for line in f:
+                    if line.strip():
+                        lines.append(line)
+                        self._lines += 1
+            # 최근 기록만 파싱하고, 한도를 넘겨 남아 있던 오래된 줄은 정리
+            self.records.extend(json.loads(line) for line in lines)
+            if self._lines > max_records:
+                self._compact()
+
+    def _compact(self):
+        tmp = self.path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            f.writelines(json.dumps(r, ensure_ascii=False) + "\n" for r in self.records)
+        os.replace(tmp, self.path)
+        self._lines = len(self.records)
+
+    def add(self, record):
+        line = json.dumps(record, ensure_ascii=False)
+        with self._lock:
+            self.records.append(record)
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write(line + "\n")
+            self._lines += 1
+            if self._lines > self.max_lines:
+                self._compact()
+
+    def snapshot(self):
+        with self._lock:
+            return list(self.records)
+
+
+_shared = None
+_shared_lock = threading.Lock()
+
+
+def shared_log():
+    global _shared
+    with _shared_lock:
+        if _shared is None:
+            _shared = MetricsLog()
+        return _shared
+
+
+@contextmanager
+def team_context(team_name):
+    # 이 안에서 기록되는 span/토큰 사용량은 해당 팀으로 집계 (workers.submit 작업에도 전달)
+    token = _team.set(team_name)
+    try:
+        yield
+    finally:
+        _team.reset(token)
+
+
+def set_team(team_name):
+    # Streamlit 스크립트처럼 블록으로 감싸기 어려운 곳에서 현재 팀 지정
+    _team.set(team_name)
+
+
+@contextmanager
+def span(name, min_seconds=0, **attrs):
+    """``with span("docs_fetch"):`` 블록의 소요 시간을 기록합니다.
+
+    ``min_seconds`` 보다 빨리 성공한 블록(캐시 적중 등)은 기록하지 않습니다.
+    """
+    start = time.perf_counter()
+    ok = False
+    try:
+        yield
+        ok = True
+    finally:
+        seconds = time.perf_counter() - start
+        if not ok or seconds >= min_seconds:
+            shared_log().add({
+                "type": "span", "name": name, "team": _team.get(),
+                "seconds": round(seconds, 4), "ok": ok, "ts": time.time(), **attrs,
+            })
+
+
+def traced(name, fn, *args, **kwargs):
+    # workers.submit(traced, "contribution", fn, ...) 처럼 작업 전체를 하나의 span 으로 기록
+    with span(name):
+        return fn(*args, **kwargs)
+
+
+def record_usage(model, usage, cached=False):
+    """OpenAI 응답의 ``usage`` (없으면 0)로 토큰 수와 예상 비용을 기록합니다."""
+    prompt_tokens = getattr(usage, "prompt_tokens", 0) or 0
+    completion_tokens = getattr(usage, "completion_tokens", 0) or 0
+    shared_log().add({
+        "type": "usage", "model": model, "team": _team.get(), "cached": cached,
+        "prompt_tokens": prompt_tokens, "completion_tokens": completion_tokens,
+        "cost": round(estimate_cost(model, prompt_tokens, completion_tokens), 6), "ts": time.time(),
+    })
+
+
+def stage_stats(records=None):
+    """단계별 [{"단계", "횟수", "p50(초)", "p95(초)", "실패"}] (p95 느린 순)."""
+    import pandas as pd
+    spans = pd.DataFrame([r for r in (records if records is not None else shared_log().snapshot())
+                          if r.get("type") == "span"])
+    if spans.empty:
+        return pd.DataFrame(columns=["단계", "횟수", "p50(초)", "p95(초)", "실패"])
+    g = spans.groupby("name")["seconds"]
+    stats = pd.DataFrame({
+        "횟수": g.size(),
+        "p50(초)": g.quantile(0.5).round(3),
+        "p95(초)": g.quantile(0.95).round(3),
+        "실패": (~spans["ok"].astype(bool)).groupby(spans["name"]).sum(),
+    })
+    return stats.sort_values("p95(초)", ascending=False).rename_axis("단계").reset_index()
+
+
+def cost_by_team(records=None):
+    """팀별 [{"팀명", "요청 수", "캐시 적중", "입력 토큰", "출력 토큰", "예상 비용($)"}]."""
+    import pandas as pd
+    usage = pd.DataFrame([r for r in (records if records is not None else shared_log().snapshot())
+                          if r.get("type") == "usage"])
+    if usage.empty:
+        return pd.DataFrame(columns=["팀명", "요청 수", "캐시 적중", "입력 토큰", "출력 토큰", "예상 비용($)"])
+    usage["team"] = usage["team"].fillna("(팀 없음)")
+    g = usage.groupby("team")
+    costs = pd.DataFrame({
+        "요청 수": g.size(),
+        "캐시 적중": g["cached"].sum(),
+        "입력 토큰": g["prompt_tokens"].sum(),
+        "출력 토큰": g["completion_tokens"].sum(),
+        "예상 비용($)": g["cost"].sum().round(4),
+    })
+    return costs.sort_values("예상 비용($)", ascending=False).rename_axis("팀명").reset_index()
+
+
+def main():
+    records = MetricsLog().snapshot()
+    print(f"📈 {METRICS_PATH} (최근 {len(records)}건)\n")
+    print(stage_stats(records).to_string(index=False))
+    print()
+    print(cost_by_team(records).to_string(index=False))
+
+
+if __name__ == "__main__":
+    main()
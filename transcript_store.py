@@ -0,0 +1,144 @@
+import gzip
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+
+from settings import cache_path
+
+try:
+    import zstandard
+except ImportError:  # zstandard가 없으면 gzip으로 압축
+    zstandard = None
+
+BLOB_DIR = cache_path("blobs", "")
+
+# ✅ 시트 "전체 회의록" 칸에 본문 대신 넣는 참조 (sha256:<본문 해시>:<글자 수>)
+REF_PREFIX = "sha256:"
+
+# ✅ 최근에 읽은 본문을 메모리에 보관하는 개수
+MEMORY_ITEMS = 64
+
+
+def content_hash(text):
+    return hashlib.sha256((text or "").strip().encode("utf-8")).hexdigest()
+
+
+def make_ref(digest, length):
+    return f"{REF_PREFIX}{digest}:{length}"
+
+
+def parse_ref(value):
+    """참조 문자열 → (해시, 글자 수). 본문이 그대로 들어 있는 예전 행이면 None."""
+    value = (value or "").strip()
+    if not value.startswith(REF_PREFIX):
+        return None
+    digest, _, length = value[len(REF_PREFIX):].partition(":")
+    if len(digest) != 64 or not length.isdigit():
+        return None
+    return digest, int(length)
+
+
+def transcript_hash(value):
+    # 참조면 그 해시, 예전 행(본문)이면 본문 해시
+    ref = parse_ref(value)
+    return ref[0] if ref else content_hash(value)
+
+
+class BlobStore:
+    """본문 해시 → 압축한 회의록 본문 (로컬 파일, 같은 본문은 한 번만 저장).
+
+    ``<폴더>/<해시 앞 2자리>/<해시>.zst`` (zstandard 가 없으면 ``.gz``) 에 보관합니다.
+    시트에는 참조만 남으므로 이 폴더(기본 ``.cache/blobs``)는 배포 간에 유지하고 백업해야 합니다.
+    """
+
+    def __init__(self, directory=BLOB_DIR, memory_items=MEMORY_ITEMS):
+        self.directory = directory
+        self.memory_items = memory_items
+        self._memory = OrderedDict()
+        self._lock = threading.Lock()
+        self.missing = set()  # 참조는 있는데 본문 파일을 찾지 못한 해시 (관리자 화면에 표시)
+
+    def _path(self, digest, ext):
+        return os.path.join(self.directory, digest[:2], f"{digest}{ext}")
+
+    def _remember(self, digest, text):
+        with self._lock:
+            self._memory[digest] = text
+            self._memory.move_to_end(digest)
+            while len(self._memory) > self.memory_items:
+                self._memory.popitem(last=False)
+
+    def put(self, text):
+        """본문을 저장하고 (해시, 글자 수) 를 반환합니다. 이미 있으면 다시 쓰지 않습니다."""
+        text = text or ""
+        digest = content_hash(text)
+        if not any(os.path.exists(self._path(digest, ext)) for ext in (".zst", ".gz")):
+            data = text.encode("utf-8")
+            if zstandard is not None:
+                path, data = self._path(digest, ".zst"), zstandard.ZstdCompressor(level=10).compress(data)
+            else:
+                path, data = self._path(digest, ".gz"), gzip.compress(data, compresslevel=6)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            # 임시 파일에 쓴 뒤 이름을 바꿔 다른 스레드가 반쯤 쓴 파일을 읽지 않게 함
+            tmp = f"{path}.{threading.get_ident()}.tmp"
+            with open(tmp, "wb") as f:
+                f.write(data)
+            os.replace(tmp, path)
+        self._remember(digest, text)
+        return digest, len(text)
+
+    def get(self, digest):
+        """해시에 해당하는 본문. 이 저장소에 없으면 None."""
+        with self._lock:
+            if digest in self._memory:
+                self._memory.move_to_end(digest)
+                return self._memory[digest]
+        path = self._path(digest, ".zst")
+        if zstandard is not None and os.path.exists(path):
+            with open(path, "rb") as f:
+                text = zstandard.ZstdDecompressor().decompress(f.read()).decode("utf-8")
+        elif os.path.exists(self._path(digest, ".gz")):
+            with open(self._path(digest, ".gz"), "rb") as f:
+                text = gzip.decompress(f.read()).decode("utf-8")
+        else:
+            return None
+        self._remember(digest, text)
+        return text
+
+    def store(self, value):
+        # 본문 → 참조 (이미 참조면 그대로)
+        if parse_ref(value):
+            return value
+        return make_ref(*self.put(value))
+
+    def load(self, value):
+        # 참조 → 본문 (예전 행처럼 본문이 그대로 있으면 그대로, 본문 파일이 없으면 빈 문자열)
+        ref = parse_ref(value)
+        if ref is None:
+            return value or ""
+        text = self.get(ref[0])
+        if text is None:
+            with self._lock:
+                first = ref[0] not in self.missing
+                self.missing.add(ref[0])
+            if first:
+                print(f"⚠️ 회의록 본문을 찾을 수 없습니다: {ref[0][:12]}")
+            return ""
+        return text
+
+    def missing_count(self):
+        with self._lock:
+            return len(self.missing)
+
+
+_shared = None
+_shared_lock = threading.Lock()
+
+
+def shared_blobs():
+    global _shared
+    with _shared_lock:
+        if _shared is None:
+            _shared = BlobStore()
+        return _shared
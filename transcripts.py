@@ -0,0 +1,78 @@
+import json
+import os
+import threading
+
+from settings import cache_path
+
+TRANSCRIPT_DIR = cache_path("transcripts", "")
+
+
+# ✅ 구글 문서 본문(JSON)에서 텍스트만 추출
+def extract_text(elements):
+    parts = []
+    for v in elements:
+        if 'paragraph' in v:
+            for elem in v['paragraph'].get('elements', []):
+                if 'textRun' in elem:
+                    parts.append(elem['textRun']['content'])
+    return ''.join(parts)
+
+
+class TranscriptCache:
+    """문서 ID + 수정 시각(Drive modifiedTime)으로 회의록 텍스트를 로컬에 보관합니다.
+
+    Drive 목록의 modifiedTime이 저장된 값과 같으면 Docs API를 호출하지 않습니다.
+    """
+
+    def __init__(self, directory=TRANSCRIPT_DIR):
+        self.directory = directory
+        self._memory = {}
+        self._lock = threading.Lock()
+
+    def _path(self, doc_id):
+        return os.path.join(self.directory, f"{doc_id}.json")
+
+    def _read(self, doc_id):
+        entry = self._memory.get(doc_id)
+        if entry is None and os.path.exists(self._path(doc_id)):
+            with open(self._path(doc_id), encoding="utf-8") as f:
+                entry = self._memory[doc_id] = json.load(f)
+        return entry
+
+    def _write(self, doc_id, entry):
+        self._memory[doc_id] = entry
+        tmp = self._path(doc_id) + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(entry, f, ensure_ascii=False)
+        os.replace(tmp, self._path(doc_id))
+
+    def get(self, doc_id, modified_time):
+        if not modified_time:
+            return None
+        with self._lock:
+            entry = self._read(doc_id)
+        if entry and entry.get("modifiedTime") == modified_time:
+            return entry["text"]
+        return None
+
+    def fetch(self, docs_service, doc_id, modified_time=None):
+        """캐시에 같은 버전이 있으면 바로 반환하고, 없으면 문서를 받아 저장합니다."""
+        text = self.get(doc_id, modified_time)
+        if text is not None:
+            return text
+        doc = docs_service.documents().get(documentId=doc_id).execute()
+        text = extract_text(doc.get("body", {}).get("content", []))
+        with self._lock:
+            self._write(doc_id, {
+                "modifiedTime": modified_time,
+                "revisionId": doc.get("revisionId"),
+                "text": text,
+            })
+        return text
+
+
+_shared = TranscriptCache()
+
+
+def fetch_transcript(docs_service, doc_id, modified_time=None):
+    return _shared.fetch(docs_service, doc_id, modified_time)
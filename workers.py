@@ -0,0 +1,32 @@
+import contextvars
+from concurrent.futures import ThreadPoolExecutor, TimeoutError
+
+# ✅ 프로세스 전체에서 공유하는 API 호출용 스레드 풀
+MAX_WORKERS = 8
+
+# ✅ 호출별 제한 시간(초)
+ANALYSIS_TIMEOUT = 180
+CONTRIBUTION_TIMEOUT = 90
+
+_executor = ThreadPoolExecutor(max_workers=MAX_WORKERS, thread_name_prefix="gyogong-api")
+
+
+def submit(fn, *args, **kwargs):
+    # 작업자 스레드에서는 st.* 를 호출하지 않고 결과만 돌려받아 메인 스크립트에서 출력
+    # (tracing 의 팀 정보 같은 contextvars 는 작업자 스레드로 그대로 전달)
+    return _executor.submit(contextvars.copy_context().run, fn, *args, **kwargs)
+
+
+def wait_result(future, timeout):
+    """제한 시간 안에 결과를 기다리고, 넘으면 작업을 취소한 뒤 TimeoutError를 다시 던집니다."""
+    try:
+        return future.result(timeout=timeout)
+    except TimeoutError:
+        future.cancel()
+        raise
+
+
+def cancel_all(*futures):
+    for future in futures:
+        if future is not None and not future.done():
+            future.cancel()